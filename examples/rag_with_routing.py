@@ -3,6 +3,7 @@
 Demonstrates how agentrace traces conditional edges and branching logic.
 """
 
+import re
 from typing import TypedDict
 
 from langgraph.graph import StateGraph, START, END
@@ -19,13 +20,16 @@ class RAGState(TypedDict):
 
 
 # 2. Define nodes
+# Keyword classifiers work best as one compiled pattern: a single pass over
+# the query, with one group per intent. The earliest keyword in the query wins.
+_INTENT_RE = re.compile(r"(code|how to)|(what is|explain)", re.IGNORECASE)
+
+
 def classify_intent(state: RAGState) -> dict:
     """Classify the user's intent."""
-    query = state["query"].lower()
-    if "code" in query or "how to" in query:
-        return {"intent": "technical"}
-    elif "what is" in query or "explain" in query:
-        return {"intent": "factual"}
+    m = _INTENT_RE.search(state["query"])
+    if m:
+        return {"intent": "technical" if m.group(1) else "factual"}
     return {"intent": "conversational"}
 
 
@@ -53,14 +57,16 @@ def generate_response(state: RAGState) -> dict:
     return {"response": f"Based on [{docs}]: Answer to '{state['query']}'"}
 
 
-# 3. Routing function
+# 3. Routing function (the dispatch table is built once, not per call)
+_INTENT_ROUTES = {
+    "technical": "technical_retriever",
+    "factual": "factual_retriever",
+    "conversational": "conversational_handler",
+}
+
+
 def route_by_intent(state: RAGState) -> str:
-    intent = state.get("intent", "conversational")
-    return {
-        "technical": "technical_retriever",
-        "factual": "factual_retriever",
-        "conversational": "conversational_handler",
-    }.get(intent, "conversational_handler")
+    return _INTENT_ROUTES.get(state.get("intent", "conversational"), "conversational_handler")
 
 
 # 4. Build graph with conditional routing
@@ -89,19 +95,17 @@ queries = [
 
 traced = wrap(graph)
 
-for query in queries:
+# One batch call runs every query; each gets its own trace
+results = traced.batch([
+    {"query": query, "intent": "", "documents": [], "response": ""}
+    for query in queries
+])
+
+for query, result, trace in zip(queries, results, traced.last_traces):
     print(f"\n{'='*60}")
     print(f"Query: {query}")
     print("=" * 60)
 
-    result = traced.invoke({
-        "query": query,
-        "intent": "",
-        "documents": [],
-        "response": "",
-    })
-    trace = traced.last_trace
-
     # Show trace
     print_trace(trace)
 
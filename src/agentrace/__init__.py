@@ -1,16 +1,20 @@
 """agentrace - Transparent tracing and instrumentation for LangGraph agents."""
 
+from typing import TYPE_CHECKING, Any
+
 __version__ = "0.1.0"
 
 from agentrace import assertions
 from agentrace.capture import capture
 from agentrace.core.models import Trace
 from agentrace.core.wrapper import wrap
-from agentrace.reporters.html import to_html
-from agentrace.reporters.json_reporter import to_json
-from agentrace.reporters.junit import to_junit_xml
-from agentrace.reporters.mermaid import to_mermaid
-from agentrace.reporters.terminal import print_trace
+
+if TYPE_CHECKING:
+    from agentrace.reporters.html import to_html
+    from agentrace.reporters.json_reporter import to_json
+    from agentrace.reporters.junit import to_junit_xml
+    from agentrace.reporters.mermaid import to_mermaid
+    from agentrace.reporters.terminal import print_trace
 
 __all__ = [
     "capture",
@@ -23,3 +27,28 @@ __all__ = [
     "Trace",
     "wrap",
 ]
+
+# Reporters are imported on first access (PEP 562) so that ``import agentrace``
+# for wrap/assertions alone does not pull in Rich or the XML machinery.
+_LAZY_REPORTERS = {
+    "print_trace": "agentrace.reporters.terminal",
+    "to_mermaid": "agentrace.reporters.mermaid",
+    "to_html": "agentrace.reporters.html",
+    "to_json": "agentrace.reporters.json_reporter",
+    "to_junit_xml": "agentrace.reporters.junit",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_REPORTERS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -4,44 +4,142 @@ Provides pytest-compatible assertions for validating agent behavior.
 Supports both legacy dict traces and Trace model objects.
 """
 
-from typing import Any, Optional
+from functools import singledispatch
+from typing import Any, Iterable, Optional
 
+from agentrace.core.models import NodeStatus
 
+# Trace accessors dispatch on the trace type once per call via singledispatch
+# (which caches the lookup per type). The generic implementation handles
+# Trace models and Trace-like objects; dict overloads handle legacy traces.
+
+
+@singledispatch
 def _get_node_names(trace: Any) -> list[str]:
     """Extract node names from either a dict trace or Trace model."""
-    if isinstance(trace, dict):
-        return trace["node_names"]
     return trace.node_names
 
 
+@_get_node_names.register
+def _(trace: dict) -> list[str]:
+    return trace["node_names"]
+
+
+@singledispatch
+def _first_positions(trace: Any, node_a: str, node_b: str) -> tuple[Optional[int], Optional[int]]:
+    """Return the first-visit index of two nodes (None if not visited)."""
+    positions = trace.node_positions
+    return positions.get(node_a), positions.get(node_b)
+
+
+@_first_positions.register
+def _(trace: dict, node_a: str, node_b: str) -> tuple[Optional[int], Optional[int]]:
+    # Single pass over the dict trace, stopping once both nodes are found
+    idx_a: Optional[int] = None
+    idx_b: Optional[int] = None
+    for i, name in enumerate(trace["node_names"]):
+        if idx_a is None and name == node_a:
+            idx_a = i
+        if idx_b is None and name == node_b:
+            idx_b = i
+        if idx_a is not None and idx_b is not None:
+            break
+    return idx_a, idx_b
+
+
+@singledispatch
 def _get_edges(trace: Any) -> list[tuple[str, str]]:
     """Extract edge tuples (from, to) from either a dict trace or Trace model."""
-    if isinstance(trace, dict):
-        return trace.get("edges", [])
     return [(e.from_node, e.to_node) for e in trace.edges]
 
 
+@_get_edges.register
+def _(trace: dict) -> list[tuple[str, str]]:
+    edges = trace.get("edges")
+    if edges is not None:
+        return edges
+    # capture() traces carry no edges; derive them from the visit order
+    names = _get_node_names(trace)
+    return list(zip(names, names[1:]))
+
+
+@singledispatch
 def _get_nodes(trace: Any) -> list[Any]:
     """Extract node execution objects/dicts from trace."""
-    if isinstance(trace, dict):
-        return trace.get("nodes", [])
     return trace.nodes
 
 
-def _get_node_status(node: Any) -> str:
-    """Get status string from a node execution (dict or model)."""
-    if isinstance(node, dict):
-        return node.get("status", "success")
-    return node.status.value
+@_get_nodes.register
+def _(trace: dict) -> list[Any]:
+    return trace.get("nodes", [])
+
+
+@singledispatch
+def _get_node_by_name(trace: Any, node_name: str) -> Any:
+    """Get a node execution by name, or None if not found."""
+    return trace.get_node(node_name)
+
 
+@_get_node_by_name.register
+def _(trace: dict, node_name: str) -> Any:
+    for n in trace.get("nodes", []):
+        if n["node_name"] == node_name:
+            return n
+    return None
 
+
+# Node accessors (dict records from capture() or NodeExecution models)
+
+
+@singledispatch
+def _get_node_status(node: Any) -> NodeStatus:
+    """Get the NodeStatus of a node execution (dict or model)."""
+    return node.status
+
+
+# Dict traces store plain strings; map them onto the enum members so callers
+# can always compare by identity (``is NodeStatus.ERROR``).
+_STATUS_BY_VALUE = {s.value: s for s in NodeStatus}
+
+
+@_get_node_status.register
+def _(node: dict) -> NodeStatus:
+    return _STATUS_BY_VALUE.get(node.get("status", "success"), NodeStatus.SUCCESS)
+
+
+@singledispatch
 def _get_node_name(node: Any) -> str:
     """Get node name from a node execution (dict or model)."""
-    if isinstance(node, dict):
-        return node["node_name"]
     return node.node_name
 
 
+@_get_node_name.register
+def _(node: dict) -> str:
+    return node["node_name"]
+
+
+@singledispatch
+def _get_node_state(node: Any) -> Any:
+    """Get the output state of a node execution (dict or model)."""
+    return node.state_after
+
+
+@_get_node_state.register
+def _(node: dict) -> Any:
+    return node.get("output", {})
+
+
+@singledispatch
+def _get_node_duration(node: Any) -> float:
+    """Get the duration (ms) of a node execution (dict or model)."""
+    return node.duration_ms
+
+
+@_get_node_duration.register
+def _(node: dict) -> float:
+    return node.get("duration_ms", 0)
+
+
 # ---------------------------------------------------------------------------
 # Core assertions (task-015)
 # ---------------------------------------------------------------------------
@@ -63,16 +161,40 @@ def node_was_not_visited(trace: Any, node_name: str) -> None:
         )
 
 
+def all_nodes_visited(trace: Any, node_names: Iterable[str]) -> None:
+    """Assert that every node in ``node_names`` was visited during execution.
+
+    Equivalent to calling ``node_was_visited`` for each name, but checks them
+    all against the visited set at once and reports every missing node.
+    ``node_names`` must be a collection of names; a plain string raises
+    ``TypeError`` rather than being checked character by character.
+    """
+    if isinstance(node_names, str):
+        raise TypeError(
+            "all_nodes_visited() expects a collection of node names, got a str; "
+            "use node_was_visited() for a single node"
+        )
+    visited = _get_node_names(trace)
+    missing = set(node_names).difference(visited)
+    if missing:
+        raise AssertionError(
+            f"Node(s) {sorted(missing)} were NOT visited.\nVisited nodes: {visited}"
+        )
+
+
 def node_visited_before(trace: Any, node_a: str, node_b: str) -> None:
     """Assert that node_a was visited before node_b."""
-    visited = _get_node_names(trace)
-    if node_a not in visited:
-        raise AssertionError(f"Node '{node_a}' was NOT visited.\nVisited nodes: {visited}")
-    if node_b not in visited:
-        raise AssertionError(f"Node '{node_b}' was NOT visited.\nVisited nodes: {visited}")
-    idx_a = visited.index(node_a)
-    idx_b = visited.index(node_b)
+    idx_a, idx_b = _first_positions(trace, node_a, node_b)
+    if idx_a is None:
+        raise AssertionError(
+            f"Node '{node_a}' was NOT visited.\nVisited nodes: {_get_node_names(trace)}"
+        )
+    if idx_b is None:
+        raise AssertionError(
+            f"Node '{node_b}' was NOT visited.\nVisited nodes: {_get_node_names(trace)}"
+        )
     if idx_a >= idx_b:
+        visited = _get_node_names(trace)
         raise AssertionError(
             f"Node '{node_a}' (position {idx_a}) was NOT visited before "
             f"'{node_b}' (position {idx_b}).\n"
@@ -93,11 +215,12 @@ def edge_taken(trace: Any, from_node: str, to_node: str) -> None:
 def no_errors(trace: Any) -> None:
     """Assert that no nodes had errors during execution."""
     nodes = _get_nodes(trace)
-    errored = [_get_node_name(n) for n in nodes if _get_node_status(n) == "error"]
-    if errored:
-        raise AssertionError(
-            f"Expected no errors, but {len(errored)} node(s) had errors: {errored}"
-        )
+    get_status = _get_node_status
+    if not any(get_status(n) is NodeStatus.ERROR for n in nodes):
+        return
+    # Failure path only: collect the names for the message
+    errored = [_get_node_name(n) for n in nodes if get_status(n) is NodeStatus.ERROR]
+    raise AssertionError(f"Expected no errors, but {len(errored)} node(s) had errors: {errored}")
 
 
 def total_nodes_visited(
@@ -123,19 +246,14 @@ def total_nodes_visited(
 # ---------------------------------------------------------------------------
 
 
-def _get_node_by_name(trace: Any, node_name: str) -> Any:
+def _require_node(trace: Any, node_name: str) -> Any:
     """Get a node execution by name, raising if not found."""
-    if isinstance(trace, dict):
-        for n in trace.get("nodes", []):
-            if n["node_name"] == node_name:
-                return n
-    else:
-        node = trace.get_node(node_name)
-        if node is not None:
-            return node
-    raise AssertionError(
-        f"Node '{node_name}' was NOT visited.\nVisited nodes: {_get_node_names(trace)}"
-    )
+    node = _get_node_by_name(trace, node_name)
+    if node is None:
+        raise AssertionError(
+            f"Node '{node_name}' was NOT visited.\nVisited nodes: {_get_node_names(trace)}"
+        )
+    return node
 
 
 def state_at_node(
@@ -148,11 +266,7 @@ def state_at_node(
     The predicate receives the node's state_after (Trace) or output (dict)
     and should return True/False or raise an exception.
     """
-    node = _get_node_by_name(trace, node_name)
-    if isinstance(node, dict):
-        state = node.get("output", {})
-    else:
-        state = node.state_after
+    state = _get_node_state(_require_node(trace, node_name))
 
     result = predicate(state)
     if result is False:
@@ -161,11 +275,7 @@ def state_at_node(
 
 def max_duration(trace: Any, node_name: str, ms: float) -> None:
     """Assert that a node executed within the given time limit (ms)."""
-    node = _get_node_by_name(trace, node_name)
-    if isinstance(node, dict):
-        actual = node.get("duration_ms", 0)
-    else:
-        actual = node.duration_ms
+    actual = _get_node_duration(_require_node(trace, node_name))
 
     if actual > ms:
         raise AssertionError(
@@ -4,9 +4,12 @@ Uses LangGraph's .stream(stream_mode="updates") to capture node executions.
 This is the quick PoC approach — Phase 2 will migrate to BaseCallbackHandler.
 """
 
+import sys
 import time
 from typing import Any
 
+from agentrace.core import config
+
 
 def capture(graph: Any, input_data: dict) -> dict:
     """Capture a trace from a LangGraph compiled graph execution.
@@ -22,28 +25,43 @@ def capture(graph: Any, input_data: dict) -> dict:
             - nodes: list of NodeExecution dicts
             - node_names: ordered list of visited node names
             - total_duration_ms: total execution time
+
+        With ``AGENTRACE_DISABLED=1`` the graph is simply invoked and the
+        returned dict has an empty ``nodes`` list.
     """
+    if config.TRACING_DISABLED:
+        return {
+            "input": input_data,
+            "output": graph.invoke(input_data),
+            "nodes": [],
+            "node_names": [],
+            "total_duration_ms": 0.0,
+        }
+
     nodes: list[dict] = []
+    append = nodes.append
+    perf_counter_ns = time.perf_counter_ns
+    intern = sys.intern
     output_state: dict = dict(input_data)
+    update_state = output_state.update
     step = 0
 
-    trace_start = time.perf_counter()
+    trace_start_ns = perf_counter_ns()
+    # We can't measure exact node start from stream events, so we
+    # approximate: start = previous node's end (or trace start)
+    last_end_ns = trace_start_ns
 
     for chunk in graph.stream(input_data, stream_mode="updates"):
-        node_end = time.perf_counter()
+        node_end_ns = perf_counter_ns()
+        # Integer ns delta; converted to float once per chunk
+        duration_ms = (node_end_ns - last_end_ns) / 1_000_000
+        node_start = last_end_ns / 1_000_000_000
+        node_end = node_end_ns / 1_000_000_000
 
         for node_name, node_output in chunk.items():
+            node_name = intern(node_name)
             step += 1
-            # We can't measure exact node start from stream events,
-            # so we approximate: start = previous node's end (or trace start)
-            if nodes:
-                node_start = nodes[-1]["timestamp_end"]
-            else:
-                node_start = trace_start
-
-            duration_ms = (node_end - node_start) * 1000
-
-            nodes.append(
+            append(
                 {
                     "node_name": node_name,
                     "output": node_output,
@@ -56,10 +74,16 @@ def capture(graph: Any, input_data: dict) -> dict:
 
             # Accumulate state
             if isinstance(node_output, dict):
-                output_state.update(node_output)
+                update_state(node_output)
+
+            # Later nodes in the same chunk start where the previous one ended,
+            # so the chunk's time is attributed to its first node only
+            node_start = node_end
+            duration_ms = 0.0
+
+        last_end_ns = node_end_ns
 
-    trace_end = time.perf_counter()
-    total_duration_ms = (trace_end - trace_start) * 1000
+    total_duration_ms = (perf_counter_ns() - trace_start_ns) / 1_000_000
 
     return {
         "input": input_data,
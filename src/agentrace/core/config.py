@@ -0,0 +1,13 @@
+"""Runtime switches read once from the environment at import time."""
+
+import os
+
+
+def _env_flag(name: str) -> bool:
+    """Interpret an environment variable as a boolean flag."""
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+# AGENTRACE_DISABLED=1 turns wrap()/capture() into pass-throughs: graphs run
+# without callbacks, diffing, or timing, and no traces are recorded.
+TRACING_DISABLED = _env_flag("AGENTRACE_DISABLED")
@@ -2,85 +2,87 @@
 
 from typing import Any, Optional
 
-from deepdiff import DeepDiff
-
 
 def compute_state_diff(before: dict[str, Any], after: dict[str, Any]) -> Optional[dict[str, Any]]:
     """Compute the diff between two state dicts.
 
     Returns a dict with keys "added", "changed", "removed", or None if
-    the states are identical.
+    the states are identical. Nested dicts are compared key by key and
+    reported with dotted paths (e.g. ``"config.model"``); any other value
+    is compared as a whole.
     """
-    diff = DeepDiff(before, after, verbose_level=2)
+    added: dict[str, Any] = {}
+    changed: dict[str, Any] = {}
+    removed: dict[str, Any] = {}
 
-    if not diff:
-        return None
+    _diff_into(before, after, "", added, changed, removed)
+    return _build_diff(added, changed, removed)
 
-    result: dict[str, Any] = {}
 
-    # Keys added to the dict
-    if "dictionary_item_added" in diff:
-        added = {}
-        for path, value in diff["dictionary_item_added"].items():
-            key = _extract_key(path)
-            added[key] = value
-        if added:
-            result["added"] = added
-
-    # Values that changed
-    if "values_changed" in diff:
-        changed = {}
-        for path, change in diff["values_changed"].items():
-            key = _extract_key(path)
-            changed[key] = {"old": change["old_value"], "new": change["new_value"]}
-        if changed:
-            result["changed"] = changed
-
-    # Type changes
-    if "type_changes" in diff:
-        changed = result.get("changed", {})
-        for path, change in diff["type_changes"].items():
-            key = _extract_key(path)
-            changed[key] = {"old": change["old_value"], "new": change["new_value"]}
-        if changed:
-            result["changed"] = changed
-
-    # Keys removed from the dict
-    if "dictionary_item_removed" in diff:
-        removed = {}
-        for path, value in diff["dictionary_item_removed"].items():
-            key = _extract_key(path)
-            removed[key] = value
-        if removed:
-            result["removed"] = removed
-
-    # Iterable item changes (e.g. list items added/removed)
-    if "iterable_item_added" in diff:
-        added = result.get("added", {})
-        for path, value in diff["iterable_item_added"].items():
-            key = _extract_key(path)
-            added[key] = value
-        if added:
-            result["added"] = added
-
-    if "iterable_item_removed" in diff:
-        removed = result.get("removed", {})
-        for path, value in diff["iterable_item_removed"].items():
-            key = _extract_key(path)
-            removed[key] = value
-        if removed:
-            result["removed"] = removed
+def compute_update_diff(before: dict[str, Any], update: dict[str, Any]) -> Optional[dict[str, Any]]:
+    """Compute the diff produced by merging a partial ``update`` into ``before``.
+
+    Equivalent to ``compute_state_diff(before, {**before, **update})``, but
+    only the keys present in ``update`` are compared, so the cost scales with
+    the size of the update rather than the whole state. Top-level keys are
+    never reported as removed.
+    """
+    added: dict[str, Any] = {}
+    changed: dict[str, Any] = {}
+    removed: dict[str, Any] = {}
 
+    _diff_keys_into(before, update, "", added, changed, removed)
+    return _build_diff(added, changed, removed)
+
+
+def _build_diff(
+    added: dict[str, Any], changed: dict[str, Any], removed: dict[str, Any]
+) -> Optional[dict[str, Any]]:
+    """Assemble the public diff dict, keeping only non-empty sections."""
+    result: dict[str, Any] = {}
+    if added:
+        result["added"] = added
+    if changed:
+        result["changed"] = changed
+    if removed:
+        result["removed"] = removed
     return result if result else None
 
 
-def _extract_key(path: str) -> str:
-    """Extract a readable key from a DeepDiff path like \"root['key']\"."""
-    # Remove "root" prefix and clean up brackets
-    cleaned = path.replace("root", "", 1)
-    # Convert ['key'] to .key notation
-    cleaned = cleaned.replace("['", ".").replace("']", "")
-    # Remove leading dot
-    if cleaned.startswith("."):
-        cleaned = cleaned[1:]
-    return cleaned
+def _diff_into(
+    before: dict[str, Any],
+    after: dict[str, Any],
+    prefix: str,
+    added: dict[str, Any],
+    changed: dict[str, Any],
+    removed: dict[str, Any],
+) -> None:
+    """Accumulate the key-level differences between two dicts."""
+    _diff_keys_into(before, after, prefix, added, changed, removed)
+
+    for key, old in before.items():
+        if key not in after:
+            removed[f"{prefix}{key}"] = old
+
+
+def _diff_keys_into(
+    before: dict[str, Any],
+    after: dict[str, Any],
+    prefix: str,
+    added: dict[str, Any],
+    changed: dict[str, Any],
+    removed: dict[str, Any],
+) -> None:
+    """Accumulate additions and changes for the keys of ``after`` only."""
+    for key, new in after.items():
+        if key not in before:
+            added[f"{prefix}{key}"] = new
+            continue
+        old = before[key]
+        if old is new:
+            continue
+        if isinstance(old, dict) and isinstance(new, dict):
+            # Only walk into nested dicts when both sides are dicts
+            _diff_into(old, new, f"{prefix}{key}.", added, changed, removed)
+        elif type(old) is not type(new) or old != new:
+            changed[f"{prefix}{key}"] = {"old": old, "new": new}
@@ -1,12 +1,13 @@
 """LangChain callback handler for capturing LangGraph traces."""
 
+import sys
 import time
-from typing import Any, Optional
+from typing import Any, NamedTuple, Optional
 from uuid import UUID
 
 from langchain_core.callbacks import BaseCallbackHandler
 
-from agentrace.core.differ import compute_state_diff
+from agentrace.core.differ import compute_update_diff
 from agentrace.core.models import (
     EdgeTransition,
     NodeExecution,
@@ -14,6 +15,21 @@ from agentrace.core.models import (
     Trace,
 )
 
+# Timings are taken with perf_counter_ns() so durations are exact integer
+# deltas; they are converted to the models' float seconds / ms only once,
+# when a record is built.
+_NS_PER_S = 1_000_000_000
+_NS_PER_MS = 1_000_000
+
+
+class _OpenNode(NamedTuple):
+    """A node that has started but not yet ended, keyed by its run_id."""
+
+    name: str
+    start_ns: int
+    state_before: dict[str, Any]  # shared snapshot, see TraceInterceptor
+    metadata: dict[str, Any]
+
 
 class TraceInterceptor(BaseCallbackHandler):
     """Callback handler that captures a structured Trace from a LangGraph run.
@@ -23,18 +39,46 @@ class TraceInterceptor(BaseCallbackHandler):
     Key insight: ``on_chain_start`` receives ``metadata["langgraph_node"]`` for
     node-level events, but ``on_chain_end`` and ``on_chain_error`` do NOT.
     We track ``run_id -> node_name`` from start events to correlate.
+
+    The accumulated graph state is copy-on-write: every node end produces a
+    new dict instead of mutating the previous one. Snapshots can therefore be
+    shared by reference — a node's ``state_before`` is simply the state dict
+    current at its start, and is usually the same object as the previous
+    node's ``state_after``. Treat the state dicts on a captured ``Trace`` as
+    read-only.
+
+    For long-running graphs, ``sample_rate=N`` records only every Nth
+    successful node execution. Sampled-out nodes still advance the
+    accumulated state but are neither diffed nor stored; errored nodes are
+    always recorded unless ``always_record_errors`` is False. The number of
+    skipped executions is reported as ``metadata.sampled_count``.
+
+    ``trace.edges`` is derived from the recorded nodes when the graph run
+    ends (or fails); with sampling, edges join consecutive *recorded* nodes.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, sample_rate: int = 1, always_record_errors: bool = True) -> None:
         super().__init__()
+        if sample_rate < 1:
+            raise ValueError(f"sample_rate must be >= 1, got {sample_rate}")
+        self._sample_rate = sample_rate
+        self._always_record_errors = always_record_errors
+        self._open_nodes: dict[str, _OpenNode] = {}  # run_id -> started node
+        self.reset()
+
+    def reset(self) -> None:
+        """Prepare the handler for a new graph run.
+
+        A fresh ``Trace`` is created rather than clearing the old one, so a
+        trace handed out from a previous run is never modified.
+        """
         self.trace = Trace()
+        self.trace.metadata.sample_rate = self._sample_rate
+        self._end_count = 0
         self._accumulated_state: dict[str, Any] = {}
-        self._node_starts: dict[str, float] = {}  # run_id -> start time
-        self._node_state_before: dict[str, dict[str, Any]] = {}  # run_id -> state snapshot
-        self._node_names: dict[str, str] = {}  # run_id -> node name
-        self._node_metadata: dict[str, dict[str, Any]] = {}  # run_id -> metadata
+        self._open_nodes.clear()
+        self._graph_start_ns = 0
         self._graph_run_id: Optional[str] = None
-        self._last_node_name: Optional[str] = None
         self._step = 0
 
     def on_chain_start(
@@ -54,18 +98,24 @@ class TraceInterceptor(BaseCallbackHandler):
         if node_name is None and parent_run_id is None:
             # Graph-level start
             self._graph_run_id = str(run_id)
-            self.trace.metadata.timestamp_start = time.perf_counter()
+            self._graph_start_ns = time.perf_counter_ns()
+            self.trace.metadata.timestamp_start = self._graph_start_ns / _NS_PER_S
             self.trace.metadata.run_id = self._graph_run_id
             if isinstance(inputs, dict):
+                # Never mutated in place (see class docstring), so it can
+                # double as the initial accumulated state.
                 self.trace.metadata.input_data = dict(inputs)
-                self._accumulated_state = dict(inputs)
+                self._accumulated_state = self.trace.metadata.input_data
         elif node_name is not None:
-            # Node-level start — record for later correlation
-            rid = str(run_id)
-            self._node_names[rid] = node_name
-            self._node_metadata[rid] = dict(meta)
-            self._node_starts[rid] = time.perf_counter()
-            self._node_state_before[rid] = dict(self._accumulated_state)
+            # Node-level start — record for later correlation. Names repeat
+            # on every visit, so intern them: one string object per node, and
+            # edges built from these records share it too.
+            self._open_nodes[str(run_id)] = _OpenNode(
+                sys.intern(node_name),
+                time.perf_counter_ns(),
+                self._accumulated_state,
+                dict(meta),
+            )
 
     def on_chain_end(
         self,
@@ -78,26 +128,34 @@ class TraceInterceptor(BaseCallbackHandler):
         **kwargs: Any,
     ) -> None:
         rid = str(run_id)
-        node_name = self._node_names.pop(rid, None)
+        open_node = self._open_nodes.pop(rid, None)
 
-        if node_name is None and parent_run_id is None:
+        if open_node is None and parent_run_id is None:
             # Graph-level end
             self._finalize_graph(outputs)
-        elif node_name is not None:
+        elif open_node is not None:
             # Node-level end
-            end_time = time.perf_counter()
-            start_time = self._node_starts.pop(rid, end_time)
-            state_before = self._node_state_before.pop(rid, {})
-            node_meta = self._node_metadata.pop(rid, {})
+            end_ns = time.perf_counter_ns()
+            node_name, start_ns, state_before, node_meta = open_node
 
-            # Merge output into accumulated state
-            if isinstance(outputs, dict):
-                self._accumulated_state.update(outputs)
+            # Merge output into a fresh accumulated state (copy-on-write). A
+            # node that returns nothing leaves the current snapshot shared.
+            has_update = bool(outputs) and isinstance(outputs, dict)
+            if has_update:
+                self._accumulated_state = {**self._accumulated_state, **outputs}
 
-            state_after = dict(self._accumulated_state)
-            state_diff = compute_state_diff(state_before, state_after)
+            state_after = self._accumulated_state
 
             self._step += 1
+            self._end_count += 1
+            if self._end_count % self._sample_rate:
+                # Sampled out: keep the state moving, skip diff and record
+                self.trace.metadata.sampled_count += 1
+                return
+
+            # The node's outputs are exactly what it merged into the state, so
+            # diff those keys instead of comparing the full before/after dicts.
+            state_diff = compute_update_diff(state_before, outputs) if has_update else None
             step_num = node_meta.get("langgraph_step", self._step)
 
             node_exec = NodeExecution(
@@ -107,26 +165,14 @@ class TraceInterceptor(BaseCallbackHandler):
                 state_before=state_before,
                 state_after=state_after,
                 state_diff=state_diff,
-                timestamp_start=start_time,
-                timestamp_end=end_time,
-                duration_ms=(end_time - start_time) * 1000,
+                timestamp_start=start_ns / _NS_PER_S,
+                timestamp_end=end_ns / _NS_PER_S,
+                duration_ms=(end_ns - start_ns) / _NS_PER_MS,
                 run_id=rid,
                 metadata=node_meta,
             )
             self.trace.nodes.append(node_exec)
 
-            # Create edge from previous node
-            if self._last_node_name is not None:
-                edge = EdgeTransition(
-                    from_node=self._last_node_name,
-                    to_node=node_name,
-                    step=step_num,
-                    timestamp=end_time,
-                )
-                self.trace.edges.append(edge)
-
-            self._last_node_name = node_name
-
     def on_chain_error(
         self,
         error: BaseException,
@@ -138,16 +184,19 @@ class TraceInterceptor(BaseCallbackHandler):
         **kwargs: Any,
     ) -> None:
         rid = str(run_id)
-        node_name = self._node_names.pop(rid, None)
+        open_node = self._open_nodes.pop(rid, None)
 
-        if node_name is not None:
+        if open_node is not None:
             # Node-level error
-            end_time = time.perf_counter()
-            start_time = self._node_starts.pop(rid, end_time)
-            state_before = self._node_state_before.pop(rid, {})
-            node_meta = self._node_metadata.pop(rid, {})
+            end_ns = time.perf_counter_ns()
+            node_name, start_ns, state_before, node_meta = open_node
 
             self._step += 1
+            if not self._always_record_errors:
+                self._end_count += 1
+                if self._end_count % self._sample_rate:
+                    self.trace.metadata.sampled_count += 1
+                    return
             step_num = node_meta.get("langgraph_step", self._step)
 
             node_exec = NodeExecution(
@@ -155,40 +204,41 @@ class TraceInterceptor(BaseCallbackHandler):
                 step=step_num,
                 status=NodeStatus.ERROR,
                 state_before=state_before,
-                state_after=dict(self._accumulated_state),
+                state_after=self._accumulated_state,
                 state_diff=None,
-                timestamp_start=start_time,
-                timestamp_end=end_time,
-                duration_ms=(end_time - start_time) * 1000,
+                timestamp_start=start_ns / _NS_PER_S,
+                timestamp_end=end_ns / _NS_PER_S,
+                duration_ms=(end_ns - start_ns) / _NS_PER_MS,
                 error=str(error),
                 run_id=rid,
                 metadata=node_meta,
             )
             self.trace.nodes.append(node_exec)
 
-            if self._last_node_name is not None:
-                edge = EdgeTransition(
-                    from_node=self._last_node_name,
-                    to_node=node_name,
-                    step=step_num,
-                    timestamp=end_time,
-                )
-                self.trace.edges.append(edge)
-
-            self._last_node_name = node_name
-
         elif rid == self._graph_run_id:
             # Graph-level error — finalize what we have
             self._finalize_graph(None)
 
     def _finalize_graph(self, outputs: Any) -> None:
         """Finalize the graph-level trace metadata."""
-        end_time = time.perf_counter()
-        self.trace.metadata.timestamp_end = end_time
-        self.trace.metadata.duration_ms = (end_time - self.trace.metadata.timestamp_start) * 1000
+        end_ns = time.perf_counter_ns()
+        self.trace.metadata.timestamp_end = end_ns / _NS_PER_S
+        self.trace.metadata.duration_ms = (end_ns - self._graph_start_ns) / _NS_PER_MS
         if isinstance(outputs, dict):
             self.trace.metadata.output_data = dict(outputs)
-        self.trace.metadata.total_nodes = len(self.trace.nodes)
+        # Edges are consecutive pairs of recorded nodes, so they are built once
+        # here rather than allocated on every node end.
+        nodes = self.trace.nodes
+        self.trace.edges = [
+            EdgeTransition(
+                from_node=a.node_name,
+                to_node=b.node_name,
+                step=b.step,
+                timestamp=b.timestamp_start,
+            )
+            for a, b in zip(nodes, nodes[1:])
+        ]
+        self.trace.metadata.total_nodes = len(nodes)
         self.trace.metadata.error_count = sum(
-            1 for n in self.trace.nodes if n.status == NodeStatus.ERROR
+            1 for n in self.trace.nodes if n.status is NodeStatus.ERROR
         )
@@ -1,9 +1,16 @@
-"""Pydantic models for agentrace traces."""
+"""Pydantic models for agentrace traces.
+
+State payloads (``state_before``, ``state_after``, ``state_diff``, node and
+run metadata) are annotated with ``SkipValidation``: they are produced by the
+interceptor from live graph state, so revalidating them would only deep-copy
+every dict on each node. Scalar fields are still validated as usual.
+"""
 
 from enum import Enum
-from typing import Any, Optional
+from operator import attrgetter
+from typing import Any, NamedTuple, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, SkipValidation
 
 
 class NodeStatus(str, Enum):
@@ -19,15 +26,15 @@ class NodeExecution(BaseModel):
     node_name: str
     step: int
     status: NodeStatus = NodeStatus.SUCCESS
-    state_before: dict[str, Any] = Field(default_factory=dict)
-    state_after: dict[str, Any] = Field(default_factory=dict)
-    state_diff: Optional[dict[str, Any]] = None
+    state_before: SkipValidation[dict[str, Any]] = Field(default_factory=dict)
+    state_after: SkipValidation[dict[str, Any]] = Field(default_factory=dict)
+    state_diff: SkipValidation[Optional[dict[str, Any]]] = None
     timestamp_start: float = 0.0
     timestamp_end: float = 0.0
     duration_ms: float = 0.0
     error: Optional[str] = None
     run_id: Optional[str] = None
-    metadata: dict[str, Any] = Field(default_factory=dict)
+    metadata: SkipValidation[dict[str, Any]] = Field(default_factory=dict)
 
 
 class EdgeTransition(BaseModel):
@@ -48,10 +55,41 @@ class RunMetadata(BaseModel):
     timestamp_end: float = 0.0
     duration_ms: float = 0.0
     graph_name: Optional[str] = None
-    input_data: dict[str, Any] = Field(default_factory=dict)
-    output_data: dict[str, Any] = Field(default_factory=dict)
+    input_data: SkipValidation[dict[str, Any]] = Field(default_factory=dict)
+    output_data: SkipValidation[dict[str, Any]] = Field(default_factory=dict)
     total_nodes: int = 0
     error_count: int = 0
+    sample_rate: int = 1
+    sampled_count: int = 0  # node executions skipped by sampling (not in ``nodes``)
+
+
+class NodeColumns(NamedTuple):
+    """Per-field columns over a trace's nodes, in execution order.
+
+    Reporters read these parallel lists instead of each walking the node
+    models attribute by attribute. ``statuses`` holds the plain string values.
+    """
+
+    names: list[str]
+    steps: list[int]
+    statuses: list[str]
+    durations_ms: list[float]
+    errors: list[Optional[str]]
+    states_before: list[dict[str, Any]]
+    states_after: list[dict[str, Any]]
+    state_diffs: list[Optional[dict[str, Any]]]
+
+
+_node_row = attrgetter(
+    "node_name",
+    "step",
+    "status",
+    "duration_ms",
+    "error",
+    "state_before",
+    "state_after",
+    "state_diff",
+)
 
 
 class Trace(BaseModel):
@@ -61,22 +99,88 @@ class Trace(BaseModel):
     nodes: list[NodeExecution] = Field(default_factory=list)
     edges: list[EdgeTransition] = Field(default_factory=list)
 
+    # Lazily-built lookup tables and name list over ``nodes``; see ``_ensure_index``.
+    _index_key: Optional[tuple[int, int]] = PrivateAttr(default=None)
+    _name_to_node: dict[str, NodeExecution] = PrivateAttr(default_factory=dict)
+    _name_to_index: dict[str, int] = PrivateAttr(default_factory=dict)
+    _node_names: list[str] = PrivateAttr(default_factory=list)
+    _columns_key: Optional[tuple[int, int]] = PrivateAttr(default=None)
+    _columns: Optional[NodeColumns] = PrivateAttr(default=None)
+
+    def __eq__(self, other: Any) -> bool:
+        # Compare fields only: the private caches are derived from ``nodes`` and
+        # would otherwise make equality depend on which properties were read.
+        if not isinstance(other, BaseModel):
+            return NotImplemented
+        return type(self) is type(other) and self.__dict__ == other.__dict__
+
     @property
     def node_names(self) -> list[str]:
-        """Ordered list of visited node names."""
-        return [n.node_name for n in self.nodes]
+        """Ordered list of visited node names.
+
+        The names are cached alongside the name index; each call returns a new
+        list, so callers may modify it freely.
+        """
+        self._ensure_index()
+        return self._node_names.copy()
 
     @property
     def successful(self) -> bool:
         """True if all nodes completed successfully."""
-        return all(n.status == NodeStatus.SUCCESS for n in self.nodes)
+        return all(n.status is NodeStatus.SUCCESS for n in self.nodes)
+
+    @property
+    def node_positions(self) -> dict[str, int]:
+        """Mapping of node name to the index of its first execution."""
+        self._ensure_index()
+        return self._name_to_index
+
+    @property
+    def node_columns(self) -> NodeColumns:
+        """The node fields as parallel lists, built in one pass and cached.
+
+        Like the name index, the cache is invalidated when ``nodes`` is
+        replaced or changes length; treat the lists as read-only. The cache is
+        not part of model equality (see ``__eq__``).
+        """
+        key = (id(self.nodes), len(self.nodes))
+        if self._columns is None or self._columns_key != key:
+            rows = [_node_row(n) for n in self.nodes]
+            if rows:
+                columns = [list(column) for column in zip(*rows)]
+            else:
+                columns = [[] for _ in NodeColumns._fields]
+            columns[2] = [status.value for status in columns[2]]
+            self._columns = NodeColumns(*columns)
+            self._columns_key = key
+        return self._columns
 
     def get_node(self, name: str) -> Optional[NodeExecution]:
         """Get first node execution by name, or None."""
-        for n in self.nodes:
-            if n.node_name == name:
-                return n
-        return None
+        self._ensure_index()
+        return self._name_to_node.get(name)
+
+    def _ensure_index(self) -> None:
+        """(Re)build the name lookup tables if ``nodes`` changed since last use.
+
+        The index is keyed on the identity and length of the ``nodes`` list,
+        so appending nodes (as the interceptor does) or replacing the list
+        invalidates it automatically.
+        """
+        key = (id(self.nodes), len(self.nodes))
+        if self._index_key == key:
+            return
+        name_to_node: dict[str, NodeExecution] = {}
+        name_to_index: dict[str, int] = {}
+        names = [n.node_name for n in self.nodes]
+        for i, (name, n) in enumerate(zip(names, self.nodes)):
+            if name not in name_to_node:
+                name_to_node[name] = n
+                name_to_index[name] = i
+        self._name_to_node = name_to_node
+        self._name_to_index = name_to_index
+        self._node_names = names
+        self._index_key = key
 
     def to_mermaid(self, direction: str = "TD") -> str:
         """Generate a Mermaid flowchart diagram of this trace."""
@@ -96,8 +200,8 @@ class Trace(BaseModel):
 
         return to_json(self, output_path=output_path, indent=indent)
 
-    def to_junit_xml(self, output_path: Optional[str] = None) -> str:
+    def to_junit_xml(self, output_path: Optional[str] = None, pretty: bool = False) -> str:
         """Generate JUnit XML report of this trace."""
         from agentrace.reporters.junit import to_junit_xml
 
-        return to_junit_xml(self, output_path=output_path)
+        return to_junit_xml(self, output_path=output_path, pretty=pretty)
@@ -1,23 +1,46 @@
 """Wrapper API for traced graph execution."""
 
-from typing import Any, AsyncIterator, Iterator, Optional
+import threading
+from typing import Any, AsyncIterator, Iterator, Optional, Union
 
+from agentrace.core import config as agentrace_config
 from agentrace.core.interceptor import TraceInterceptor
 from agentrace.core.models import Trace
 
 
 class TracedGraph:
-    """A wrapped LangGraph compiled graph that captures traces on execution."""
+    """A wrapped LangGraph compiled graph that captures traces on execution.
 
-    def __init__(self, graph: Any) -> None:
+    When tracing is disabled (``AGENTRACE_DISABLED=1``), every method calls
+    straight through to the underlying graph and ``last_trace`` stays None.
+
+    ``sample`` is forwarded to ``TraceInterceptor`` as ``sample_rate``.
+    """
+
+    def __init__(self, graph: Any, sample: int = 1) -> None:
+        if sample < 1:
+            raise ValueError(f"sample must be >= 1, got {sample}")
         self._graph = graph
+        self._sample = sample
         self._last_trace: Optional[Trace] = None
+        self._last_traces: list[Trace] = []
+        self._enabled = not agentrace_config.TRACING_DISABLED
+        # One idle interceptor is kept for reuse by the next run. Concurrent
+        # runs (e.g. overlapping ainvoke calls) find it taken and create their own.
+        # The lock makes taking it a single step, so two threads never share one.
+        self._idle_interceptor: Optional[TraceInterceptor] = None
+        self._idle_lock = threading.Lock()
 
     @property
     def last_trace(self) -> Optional[Trace]:
         """The most recent Trace captured, or None."""
         return self._last_trace
 
+    @property
+    def last_traces(self) -> list[Trace]:
+        """The Traces captured by the most recent ``batch``/``abatch`` call."""
+        return self._last_traces
+
     def invoke(
         self, input_data: dict[str, Any], config: Optional[dict[str, Any]] = None
     ) -> dict[str, Any]:
@@ -30,15 +53,15 @@ class TracedGraph:
         Returns:
             The graph output dict.
         """
-        interceptor = TraceInterceptor()
+        if not self._enabled:
+            return self._graph.invoke(input_data, config=config)
+        interceptor = self._acquire_interceptor()
         config = self._merge_callbacks(config, interceptor)
         try:
-            result = self._graph.invoke(input_data, config=config)
-        except Exception:
+            return self._graph.invoke(input_data, config=config)
+        finally:
             self._last_trace = interceptor.trace
-            raise
-        self._last_trace = interceptor.trace
-        return result
+            self._release_interceptor(interceptor)
 
     def stream(
         self,
@@ -51,11 +74,15 @@ class TracedGraph:
         Yields each stream chunk. After iteration completes, the trace
         is available via ``.last_trace``.
         """
-        interceptor = TraceInterceptor()
+        if not self._enabled:
+            yield from self._graph.stream(input_data, config=config, **kwargs)
+            return
+        interceptor = self._acquire_interceptor()
         config = self._merge_callbacks(config, interceptor)
         for chunk in self._graph.stream(input_data, config=config, **kwargs):
             yield chunk
         self._last_trace = interceptor.trace
+        self._release_interceptor(interceptor)
 
     async def ainvoke(
         self, input_data: dict[str, Any], config: Optional[dict[str, Any]] = None
@@ -69,15 +96,15 @@ class TracedGraph:
         Returns:
             The graph output dict.
         """
-        interceptor = TraceInterceptor()
+        if not self._enabled:
+            return await self._graph.ainvoke(input_data, config=config)
+        interceptor = self._acquire_interceptor()
         config = self._merge_callbacks(config, interceptor)
         try:
-            result = await self._graph.ainvoke(input_data, config=config)
-        except Exception:
+            return await self._graph.ainvoke(input_data, config=config)
+        finally:
             self._last_trace = interceptor.trace
-            raise
-        self._last_trace = interceptor.trace
-        return result
+            self._release_interceptor(interceptor)
 
     async def astream(
         self,
@@ -90,24 +117,113 @@ class TracedGraph:
         Yields each stream chunk. After iteration completes, the trace
         is available via ``.last_trace``.
         """
-        interceptor = TraceInterceptor()
+        if not self._enabled:
+            async for chunk in self._graph.astream(input_data, config=config, **kwargs):
+                yield chunk
+            return
+        interceptor = self._acquire_interceptor()
         config = self._merge_callbacks(config, interceptor)
         async for chunk in self._graph.astream(input_data, config=config, **kwargs):
             yield chunk
         self._last_trace = interceptor.trace
+        self._release_interceptor(interceptor)
+
+    def batch(
+        self,
+        inputs: list[dict[str, Any]],
+        config: Union[dict[str, Any], list[dict[str, Any]], None] = None,
+        **kwargs: Any,
+    ) -> list[Any]:
+        """Run the graph over several inputs in one ``graph.batch`` call.
+
+        Each input gets its own interceptor. The outputs are returned in input
+        order and the matching traces are available via ``.last_traces``
+        (``.last_trace`` is the trace of the final input).
+
+        Args:
+            inputs: Input dicts to pass to the graph.
+            config: Optional LangGraph config dict, or one config per input.
+                Callbacks will be merged.
+            **kwargs: Passed through to ``graph.batch`` (e.g. ``return_exceptions``).
+
+        Returns:
+            The graph outputs, one per input.
+        """
+        if not self._enabled:
+            return self._graph.batch(inputs, config=config, **kwargs)
+        interceptors, configs = self._batch_configs(inputs, config)
+        try:
+            return self._graph.batch(inputs, config=configs, **kwargs)
+        finally:
+            self._set_batch_traces(interceptors)
+
+    async def abatch(
+        self,
+        inputs: list[dict[str, Any]],
+        config: Union[dict[str, Any], list[dict[str, Any]], None] = None,
+        **kwargs: Any,
+    ) -> list[Any]:
+        """Async version of batch — run several inputs and capture a trace for each."""
+        if not self._enabled:
+            return await self._graph.abatch(inputs, config=config, **kwargs)
+        interceptors, configs = self._batch_configs(inputs, config)
+        try:
+            return await self._graph.abatch(inputs, config=configs, **kwargs)
+        finally:
+            self._set_batch_traces(interceptors)
+
+    def _acquire_interceptor(self) -> TraceInterceptor:
+        """Take the idle interceptor if there is one, else create a new one."""
+        with self._idle_lock:
+            interceptor, self._idle_interceptor = self._idle_interceptor, None
+        if interceptor is None:
+            return TraceInterceptor(sample_rate=self._sample)
+        return interceptor
+
+    def _release_interceptor(self, interceptor: TraceInterceptor) -> None:
+        """Reset a finished interceptor and keep it for the next run."""
+        interceptor.reset()
+        with self._idle_lock:
+            self._idle_interceptor = interceptor
+
+    def _batch_configs(
+        self,
+        inputs: list[dict[str, Any]],
+        config: Union[dict[str, Any], list[dict[str, Any]], None],
+    ) -> tuple[list[TraceInterceptor], list[dict[str, Any]]]:
+        """Create one interceptor per input and the matching per-input configs."""
+        per_input = config if isinstance(config, list) else [config] * len(inputs)
+        interceptors = [TraceInterceptor(sample_rate=self._sample) for _ in inputs]
+        configs = [self._merge_callbacks(c, i) for c, i in zip(per_input, interceptors)]
+        return interceptors, configs
+
+    def _set_batch_traces(self, interceptors: list[TraceInterceptor]) -> None:
+        self._last_traces = [i.trace for i in interceptors]
+        if self._last_traces:
+            self._last_trace = self._last_traces[-1]
 
     @staticmethod
     def _merge_callbacks(
         config: Optional[dict[str, Any]], interceptor: TraceInterceptor
     ) -> dict[str, Any]:
-        """Merge the interceptor into any existing callbacks in config."""
-        config = dict(config) if config else {}
-        existing = config.get("callbacks", [])
-        config["callbacks"] = list(existing) + [interceptor]
-        return config
+        """Merge the interceptor into any existing callbacks in config.
 
-
-def wrap(graph: Any) -> TracedGraph:
+        The caller's config and callbacks list are never modified.
+        """
+        if not config:
+            return {"callbacks": [interceptor]}
+        merged = config.copy()
+        existing = config.get("callbacks")
+        if existing:
+            callbacks = list(existing)
+            callbacks.append(interceptor)
+        else:
+            callbacks = [interceptor]
+        merged["callbacks"] = callbacks
+        return merged
+
+
+def wrap(graph: Any, sample: int = 1) -> TracedGraph:
     """Wrap a compiled LangGraph for automatic trace capture.
 
     Usage::
@@ -115,5 +231,8 @@ def wrap(graph: Any) -> TracedGraph:
         traced = wrap(compiled_graph)
         result = traced.invoke({"query": "hello"})
         trace = traced.last_trace
+
+    Pass ``sample=N`` to record only every Nth successful node execution
+    (errors are always recorded), e.g. for graphs with long feedback loops.
     """
-    return TracedGraph(graph)
+    return TracedGraph(graph, sample=sample)
@@ -14,7 +14,6 @@ Usage:
 import pytest
 
 from agentrace.core.wrapper import TracedGraph, wrap
-from agentrace.reporters.terminal import print_trace
 
 
 def pytest_configure(config):
@@ -62,7 +61,10 @@ def agentrace_report(request, capsys):
 
     yield _collect
 
-    # Print reports for collected traces after test
+    # Print reports for collected traces after test. Rich is only imported
+    # here, so collecting tests that never print a report doesn't pay for it.
     if _traces:
+        from agentrace.reporters.terminal import print_trace
+
         for trace in _traces:
             print_trace(trace)
@@ -0,0 +1,31 @@
+"""Shared file-writing helpers for the reporters.
+
+Reports are written as a sequence of UTF-8 encoded chunks through one
+buffered binary handle, so only a chunk's worth of encoded bytes exists at
+any time instead of a full encoded copy of the report.
+"""
+
+import codecs
+from collections.abc import Iterable, Iterator
+from typing import Union
+
+_BUFFER_SIZE = 1 << 20
+_SLICE_SIZE = 1 << 16
+
+
+def iter_slices(text: str, size: int = _SLICE_SIZE) -> Iterator[str]:
+    """Yield ``text`` in consecutive slices of at most ``size`` characters."""
+    for start in range(0, len(text), size):
+        yield text[start : start + size]
+
+
+def write_chunks(path: str, chunks: Iterable[Union[str, bytes]]) -> None:
+    """Encode ``chunks`` as UTF-8 one at a time and write them to ``path``.
+
+    ``bytes`` chunks (e.g. pre-encoded static template parts) are written as-is.
+    """
+    encode = codecs.getincrementalencoder("utf-8")().encode
+    with open(path, "wb", buffering=_BUFFER_SIZE) as f:
+        for chunk in chunks:
+            f.write(chunk if isinstance(chunk, bytes) else encode(chunk))
+        f.write(encode("", final=True))
@@ -5,18 +5,25 @@ expandable node details, state diffs, and summary statistics.
 No external dependencies required to view the report.
 """
 
-import json
-from pathlib import Path
-from typing import Any, Optional
+from itertools import chain
+from string import Formatter
+from typing import Any, Callable, Iterator, Optional
 
+from agentrace.reporters._output import iter_slices, write_chunks
+from agentrace.reporters.json_reporter import dumps as _json_dumps
 from agentrace.reporters.mermaid import to_mermaid
 
 
 def _get_trace_data(trace: Any) -> dict:
-    """Extract trace data into a plain dict for the HTML template."""
+    """Extract trace data into a plain dict for the HTML template.
+
+    ``nodes`` is a one-shot iterator of per-node dicts, built only as the
+    cards are rendered: the per-node records are never all materialized,
+    and state payloads are only touched for the card being written.
+    """
     if isinstance(trace, dict):
         return {
-            "nodes": [
+            "nodes": (
                 {
                     "name": n["node_name"],
                     "step": n.get("step", 0),
@@ -27,7 +34,7 @@ def _get_trace_data(trace: Any) -> dict:
                     "error": None,
                 }
                 for n in trace.get("nodes", [])
-            ],
+            ),
             "total_duration_ms": trace.get("total_duration_ms", 0),
             "node_count": len(trace.get("nodes", [])),
             "error_count": 0,
@@ -35,20 +42,21 @@ def _get_trace_data(trace: Any) -> dict:
             "output": trace.get("output", {}),
         }
 
+    cols = trace.node_columns
     return {
-        "nodes": [
+        "nodes": (
             {
-                "name": n.node_name,
-                "step": n.step,
-                "status": n.status.value,
-                "duration_ms": n.duration_ms,
-                "state_before": n.state_before,
-                "state_after": n.state_after,
-                "state_diff": n.state_diff,
-                "error": n.error,
+                "name": name,
+                "step": step,
+                "status": status,
+                "duration_ms": duration_ms,
+                "state_before": before,
+                "state_after": after,
+                "state_diff": diff,
+                "error": error,
             }
-            for n in trace.nodes
-        ],
+            for name, step, status, duration_ms, error, before, after, diff in zip(*cols)
+        ),
         "total_duration_ms": trace.metadata.duration_ms,
         "node_count": trace.metadata.total_nodes,
         "error_count": trace.metadata.error_count,
@@ -164,65 +172,119 @@ document.querySelectorAll('.node-header').forEach(h => {{
 </html>
 """
 
+# The template is split around the node cards so the report can be produced
+# piece by piece (see ``iter_html``). The tail has no fields, but is run
+# through format() once here to collapse its escaped braces.
+_HTML_HEAD, _tail = _HTML_TEMPLATE.split("{node_cards}")
+_HTML_TAIL = _tail.format()
+_HTML_TAIL_BYTES = _HTML_TAIL.encode("utf-8")  # static, so encoded once for file output
+del _tail
+
+# The head is parsed once into (literal, field) pairs, with the CSS braces
+# already unescaped, so rendering is a join instead of a str.format re-parse
+# of the whole stylesheet on every report.
+_HEAD_PARTS: list[tuple[str, Optional[str]]] = [
+    (literal, field) for literal, field, _, _ in Formatter().parse(_HTML_HEAD)
+]
+
+
+def _render_head(values: dict[str, str]) -> str:
+    """Substitute ``values`` into the pre-parsed template head."""
+    return "".join(
+        [literal + values[field] if field else literal for literal, field in _HEAD_PARTS]
+    )
 
-def _build_node_card(node: dict) -> str:
-    """Build HTML for a single node card."""
-    status = node["status"]
-    icon_class = "success" if status == "success" else "error"
-    duration = f"{node['duration_ms']:.1f}ms"
 
-    body_parts = []
+_DUMPS_CACHE_SIZE = 4
 
-    if node.get("error"):
-        body_parts.append(
-            f'    <div class="detail-label">Error</div>\n'
-            f'    <pre class="error-text">{_escape(node["error"])}</pre>'
-        )
+# Node icon CSS class by status value; anything but success is shown as an error
+_ICON_CLASS = {"success": "success"}
 
-    if node.get("state_diff"):
-        body_parts.append(
-            f'    <div class="detail-label">State Diff</div>\n'
-            f"    <pre>{_escape(json.dumps(node['state_diff'], indent=2, default=str))}</pre>"
-        )
 
-    if node.get("state_before"):
-        body_parts.append(
-            f'    <div class="detail-label">State Before</div>\n'
-            f"    <pre>{_escape(json.dumps(node['state_before'], indent=2, default=str))}</pre>"
-        )
+def _make_dumps() -> Callable[[Any], str]:
+    """Return an escaped-JSON encoder that memoizes by object identity.
 
-    if node.get("state_after"):
-        body_parts.append(
-            f'    <div class="detail-label">State After</div>\n'
-            f"    <pre>{_escape(json.dumps(node['state_after'], indent=2, default=str))}</pre>"
-        )
+    Consecutive nodes share state snapshots (a node's ``state_before`` is
+    usually the previous node's ``state_after``), so within one report each
+    distinct dict is encoded and escaped only once. Only the last
+    ``_DUMPS_CACHE_SIZE`` bodies (one card plus the previous ``state_after``)
+    are kept, so memory does not grow with the number of nodes. The cache
+    holds only objects referenced by the trace being rendered, so ids stay
+    unique.
+    """
+    cache: dict[int, str] = {}
+
+    def dumps(obj: Any) -> str:
+        key = id(obj)
+        text = cache.get(key)
+        if text is None:
+            if len(cache) >= _DUMPS_CACHE_SIZE:
+                del cache[next(iter(cache))]
+            text = cache[key] = _escape(_json_dumps(obj))
+        return text
+
+    return dumps
 
+
+def _iter_sections(node: dict, dumps: Callable[[Any], str]) -> Iterator[tuple[str, str, str]]:
+    """Yield ``(label, pre attributes, escaped body)`` for each detail a node has.
+
+    Bodies are encoded lazily, as each section is reached.
+    """
+    if node.get("error"):
+        yield "Error", ' class="error-text"', _escape(node["error"])
+    if node.get("state_diff"):
+        yield "State Diff", "", dumps(node["state_diff"])
+    if node.get("state_before"):
+        yield "State Before", "", dumps(node["state_before"])
+    if node.get("state_after"):
+        yield "State After", "", dumps(node["state_after"])
     # For dict traces that have "output" instead of state_before/after
-    if node.get("output") and not node.get("state_after"):
-        body_parts.append(
-            f'    <div class="detail-label">Output</div>\n'
-            f"    <pre>{_escape(json.dumps(node['output'], indent=2, default=str))}</pre>"
-        )
+    elif node.get("output"):
+        yield "Output", "", dumps(node["output"])
+
+
+def _iter_node_card(node: dict, dumps: Optional[Callable[[Any], str]] = None) -> Iterator[str]:
+    """Yield the HTML for a single node card as a sequence of fragments.
 
-    body_html = "\n".join(body_parts) if body_parts else "    <p>No details available</p>"
+    Each (possibly large) JSON body is yielded as its own fragment, so it is
+    never copied into a larger string before being written. ``dumps`` encodes
+    a value as escaped JSON; pass a shared ``_make_dumps()`` encoder to reuse
+    work across cards.
+    """
+    if dumps is None:
+        dumps = _make_dumps()
+    icon_class = _ICON_CLASS.get(node["status"], "error")
 
-    return f"""\
+    yield f"""\
     <div class="node-card">
       <div class="node-header">
         <span class="node-icon {icon_class}"></span>
         <span class="node-name">{_escape(node["name"])}</span>
         <span class="node-step">Step {node["step"]}</span>
-        <span class="node-duration">{duration}</span>
+        <span class="node-duration">{node["duration_ms"]:.1f}ms</span>
         <span class="node-chevron">&#9654;</span>
       </div>
       <div class="node-body">
-{body_html}
-      </div>
-    </div>"""
+"""
+    empty = True
+    for label, pre_attrs, body in _iter_sections(node, dumps):
+        if not empty:
+            yield "\n"
+        yield f'    <div class="detail-label">{label}</div>\n    <pre{pre_attrs}>'
+        yield body
+        yield "</pre>"
+        empty = False
+    if empty:
+        yield "    <p>No details available</p>"
+    yield "\n      </div>\n    </div>"
 
 
 def _escape(text: str) -> str:
     """Escape HTML special characters."""
+    # A chain of str.replace is deliberate: each pass is a C-level scan that
+    # returns the string unchanged when there is nothing to replace, which
+    # beats both str.translate (per-character dict lookups) and html.escape.
     return (
         str(text)
         .replace("&", "&amp;")
@@ -232,16 +294,8 @@ def _escape(text: str) -> str:
     )
 
 
-def to_html(trace: Any, output_path: Optional[str] = None) -> str:
-    """Generate a self-contained HTML report from a trace.
-
-    Args:
-        trace: A Trace model or legacy dict trace.
-        output_path: If provided, write the HTML to this file path.
-
-    Returns:
-        The HTML string.
-    """
+def _iter_body(trace: Any) -> Iterator[str]:
+    """Yield the document head and node-card fragments (everything but the tail)."""
     data = _get_trace_data(trace)
     mermaid_code = to_mermaid(trace)
 
@@ -251,21 +305,61 @@ def to_html(trace: Any, output_path: Optional[str] = None) -> str:
     status_text = f"{data['node_count']} nodes executed in {data['total_duration_ms']:.1f}ms"
     error_class = "error" if has_errors else "success"
 
-    node_cards = "\n".join(_build_node_card(n) for n in data["nodes"])
-
-    html = _HTML_TEMPLATE.format(
-        status_text=status_text,
-        status_label=status_label,
-        status_class=status_class,
-        node_count=data["node_count"],
-        total_duration=f"{data['total_duration_ms']:.1f}ms",
-        error_count=data["error_count"],
-        error_class=error_class,
-        mermaid_code=mermaid_code,
-        node_cards=node_cards,
+    yield _render_head(
+        {
+            "status_text": status_text,
+            "status_label": status_label,
+            "status_class": status_class,
+            "node_count": str(data["node_count"]),
+            "total_duration": f"{data['total_duration_ms']:.1f}ms",
+            "error_count": str(data["error_count"]),
+            "error_class": error_class,
+            "mermaid_code": mermaid_code,
+        }
     )
+    dumps = _make_dumps()
+    for i, node in enumerate(data["nodes"]):
+        if i:
+            yield "\n"
+        yield from _iter_node_card(node, dumps)
 
-    if output_path:
-        Path(output_path).write_text(html, encoding="utf-8")
 
+def iter_html(trace: Any) -> Iterator[str]:
+    """Yield the HTML report for a trace in chunks.
+
+    The chunks are the document head, the fragments of each node card
+    (separated by newlines), and the tail; ``"".join(iter_html(trace))`` equals
+    ``to_html(trace)``. Use this to stream large reports to a file or socket
+    without holding the whole document in memory.
+    """
+    yield from _iter_body(trace)
+    yield _HTML_TAIL
+
+
+def write_html(trace: Any, output_path: str) -> None:
+    """Stream the HTML report for a trace to a file.
+
+    The chunks of ``iter_html`` are encoded and written one at a time, so the
+    full document is never held in memory. Prefer this over
+    ``to_html(trace, output_path=...)`` for large traces when the HTML string
+    itself is not needed.
+    """
+    # Same chunks as iter_html, but the static tail goes out as its cached bytes
+    write_chunks(output_path, chain(_iter_body(trace), (_HTML_TAIL_BYTES,)))
+
+
+def to_html(trace: Any, output_path: Optional[str] = None) -> str:
+    """Generate a self-contained HTML report from a trace.
+
+    Args:
+        trace: A Trace model or legacy dict trace.
+        output_path: If provided, also write the HTML to this file path.
+
+    Returns:
+        The HTML string. Because it is returned, the whole document is built
+        in memory; use ``write_html`` to write a report without doing so.
+    """
+    html = "".join(iter_html(trace))
+    if output_path:
+        write_chunks(output_path, iter_slices(html))
     return html
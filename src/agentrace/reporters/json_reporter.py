@@ -4,9 +4,80 @@ Exports traces as JSON files for CI/CD pipelines and programmatic analysis.
 """
 
 import json
+import math
+from enum import Enum
 from pathlib import Path
 from typing import Any, Optional
 
+import pydantic_core
+
+from agentrace.reporters._output import iter_slices, write_chunks
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup (pip install agentrace[fast])
+    orjson = None
+
+
+# Leaf types that orjson and json.dumps encode identically.
+_PLAIN_LEAVES = frozenset({str, int, bool, type(None)})
+
+
+def _needs_stdlib(obj: Any) -> bool:
+    """Return True if ``obj`` holds a value orjson would encode differently.
+
+    That is a NaN or infinite float (orjson writes ``null``) or a plain
+    ``Enum`` member (orjson writes its value; the stdlib goes through
+    ``default=str``). orjson has no passthrough option for enums, so this
+    walks the containers iteratively with an exact-type fast path.
+    """
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        kind = type(value)
+        if kind in _PLAIN_LEAVES:
+            continue
+        if kind is dict:
+            stack.extend(value.values())
+        elif kind is list or kind is tuple:
+            stack.extend(value)
+        elif isinstance(value, Enum) and not isinstance(value, (str, int, float)):
+            return True
+        elif isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+def dumps(obj: Any, indent: Optional[int] = 2) -> str:
+    """Encode a plain value as JSON text, with ``default=str`` for unknown types.
+
+    Uses orjson when it is installed and can produce the requested layout
+    (``indent`` of 2 or None); otherwise, or if orjson rejects the value,
+    falls back to the stdlib encoder. Datetimes and dataclasses go through
+    ``default=str`` as with the stdlib, and values holding NaN, infinity or
+    plain ``Enum`` members are encoded by the stdlib, so they come out as
+    ``NaN``/``Infinity`` and ``str(member)`` rather than ``null`` and the value.
+
+    The orjson output still differs from ``json.dumps`` in layout only: non-ASCII
+    text is written as UTF-8 instead of ``\\uXXXX`` escapes, and with
+    ``indent=None`` it is compact (no space after ``,`` and ``:``).
+    """
+    if orjson is not None and indent in (2, None) and not _needs_stdlib(obj):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        option |= orjson.OPT_PASSTHROUGH_DATACLASS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=str, option=option).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=indent, default=str)
+
 
 def to_json(trace: Any, output_path: Optional[str] = None, indent: int = 2) -> str:
     """Export a trace as a JSON string.
@@ -20,11 +91,14 @@ def to_json(trace: Any, output_path: Optional[str] = None, indent: int = 2) -> s
         The JSON string.
     """
     if isinstance(trace, dict):
-        json_str = json.dumps(trace, indent=indent, default=str)
-    else:
-        json_str = trace.model_dump_json(indent=indent)
+        json_str = dumps(trace, indent=indent)
+        if output_path:
+            write_chunks(output_path, iter_slices(json_str))
+        return json_str
 
+    # Serialize straight to UTF-8 bytes (same output as model_dump_json) so the
+    # file is written without re-encoding the decoded string.
+    json_bytes = pydantic_core.to_json(trace, indent=indent)
     if output_path:
-        Path(output_path).write_text(json_str, encoding="utf-8")
-
-    return json_str
+        Path(output_path).write_bytes(json_bytes)
+    return json_bytes.decode()
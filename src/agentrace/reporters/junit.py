@@ -6,10 +6,12 @@ and other CI/CD systems that consume test results.
 Each node execution is treated as a test case within a test suite.
 """
 
-from pathlib import Path
 from typing import Any, Optional
-from xml.dom.minidom import parseString
-from xml.etree.ElementTree import Element, SubElement, tostring
+from xml.etree.ElementTree import Element, SubElement, indent, tostring
+
+from agentrace.reporters._output import iter_slices, write_chunks
+
+_XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>\n'
 
 
 def _get_trace_info(trace: Any) -> dict:
@@ -33,31 +35,35 @@ def _get_trace_info(trace: Any) -> dict:
             ],
         }
 
-    error_count = sum(1 for n in trace.nodes if n.status.value == "error")
+    cols = trace.node_columns
     return {
         "name": "agentrace",
         "total_duration_s": trace.metadata.duration_ms / 1000,
-        "tests": len(trace.nodes),
+        "tests": len(cols.names),
         "failures": 0,
-        "errors": error_count,
+        "errors": cols.statuses.count("error"),
         "nodes": [
             {
-                "name": n.node_name,
-                "duration_s": n.duration_ms / 1000,
-                "status": n.status.value,
-                "error": n.error,
+                "name": name,
+                "duration_s": duration_ms / 1000,
+                "status": status,
+                "error": error,
             }
-            for n in trace.nodes
+            for name, duration_ms, status, error in zip(
+                cols.names, cols.durations_ms, cols.statuses, cols.errors
+            )
         ],
     }
 
 
-def to_junit_xml(trace: Any, output_path: Optional[str] = None) -> str:
+def to_junit_xml(trace: Any, output_path: Optional[str] = None, pretty: bool = False) -> str:
     """Generate JUnit XML from a trace.
 
     Args:
         trace: A Trace model or legacy dict trace.
         output_path: If provided, write XML to this file path.
+        pretty: Indent the XML for human reading. CI consumers don't need it,
+            so the compact form is the default.
 
     Returns:
         The XML string.
@@ -85,14 +91,11 @@ def to_junit_xml(trace: Any, output_path: Optional[str] = None) -> str:
             if node["error"]:
                 error_elem.text = node["error"]
 
-    raw_xml = tostring(testsuites, encoding="unicode", xml_declaration=True)
-    pretty_xml = parseString(raw_xml).toprettyxml(indent="  ")
-    # Remove extra xml declaration from minidom
-    lines = pretty_xml.split("\n")
-    pretty_xml = "\n".join(lines[1:])  # skip minidom's declaration
-    pretty_xml = '<?xml version="1.0" encoding="UTF-8"?>\n' + pretty_xml.strip()
+    if pretty:
+        indent(testsuites, space="  ")
+    xml_str = _XML_DECLARATION + tostring(testsuites, encoding="unicode")
 
     if output_path:
-        Path(output_path).write_text(pretty_xml, encoding="utf-8")
+        write_chunks(output_path, iter_slices(xml_str))
 
-    return pretty_xml
+    return xml_str
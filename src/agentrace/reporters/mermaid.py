@@ -18,13 +18,10 @@ def _get_node_info(trace: Any) -> list[dict]:
             }
             for n in trace.get("nodes", [])
         ]
+    cols = trace.node_columns
     return [
-        {
-            "name": n.node_name,
-            "status": n.status.value,
-            "duration_ms": n.duration_ms,
-        }
-        for n in trace.nodes
+        {"name": name, "status": status, "duration_ms": duration_ms}
+        for name, status, duration_ms in zip(cols.names, cols.statuses, cols.durations_ms)
     ]
 
 
@@ -45,6 +42,9 @@ _STATUS_STYLES = {
     "error": "fill:#f8d7da,stroke:#dc3545,color:#721c24",
 }
 
+# Line suffixes per status, so a style line is one concatenation per node
+_STYLE_SUFFIX = {k: f" {v}" for k, v in _STATUS_STYLES.items()}
+
 
 def to_mermaid(trace: Any, direction: str = "TD") -> str:
     """Generate a Mermaid flowchart from a trace.
@@ -60,34 +60,40 @@ def to_mermaid(trace: Any, direction: str = "TD") -> str:
     edges = _get_edge_info(trace)
     lines = [f"graph {direction}"]
 
+    # Sanitize each distinct name once; nodes and edges repeat the same few
+    ids: dict[str, str] = {}
+    for node in nodes:
+        name = node["name"]
+        if name not in ids:
+            ids[name] = _sanitize_id(name)
+
     # Start node
     if nodes:
-        first_id = _sanitize_id(nodes[0]["name"])
-        lines.append(f"    START(( )) --> {first_id}")
+        lines.append(f"    START(( )) --> {ids[nodes[0]['name']]}")
 
-    # Node definitions with duration labels
+    # Node definitions with duration labels; styles by status are collected
+    # in the same pass and emitted after the edges
+    style_lines = []
     for node in nodes:
-        nid = _sanitize_id(node["name"])
-        duration = node["duration_ms"]
-        label = f"{node['name']}\\n{duration:.1f}ms"
+        nid = ids[node["name"]]
+        label = f"{node['name']}\\n{node['duration_ms']:.1f}ms"
         lines.append(f'    {nid}["{label}"]')
+        style_lines.append(
+            "    style " + nid + _STYLE_SUFFIX.get(node["status"], _STYLE_SUFFIX["success"])
+        )
 
     # Last node to END
     if nodes:
-        last_id = _sanitize_id(nodes[-1]["name"])
-        lines.append(f"    {last_id} --> END(( ))")
+        lines.append(f"    {ids[nodes[-1]['name']]} --> END(( ))")
 
     # Edges
     for edge in edges:
-        from_id = _sanitize_id(edge["from_node"])
-        to_id = _sanitize_id(edge["to_node"])
+        from_node, to_node = edge["from_node"], edge["to_node"]
+        from_id = ids.get(from_node) or _sanitize_id(from_node)
+        to_id = ids.get(to_node) or _sanitize_id(to_node)
         lines.append(f"    {from_id} --> {to_id}")
 
-    # Styles by status
-    for node in nodes:
-        nid = _sanitize_id(node["name"])
-        style = _STATUS_STYLES.get(node["status"], _STATUS_STYLES["success"])
-        lines.append(f"    style {nid} {style}")
+    lines.extend(style_lines)
 
     # Style start/end circles
     lines.append("    style START fill:#000,stroke:#000,color:#fff")
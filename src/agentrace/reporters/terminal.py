@@ -10,9 +10,20 @@ from typing import Any
 
 from rich.console import Console
 from rich.panel import Panel
-from rich.table import Table
+from rich.text import Text
 from rich.tree import Tree
 
+# Node lines are built as Text objects rather than markup strings: Rich then
+# has no markup to parse per node, and names or errors containing "[...]"
+# are shown verbatim instead of being read as style tags.
+_OK = ("OK", "green")
+_ERR = ("ERR", "red")
+
+# Keyed on the status value; any status other than success renders as an error
+_STATUS_ICON = {"success": _OK}
+_STATUS_CELL = {"success": "[green]OK[/green]"}
+_ERR_CELL = "[red]ERR[/red]"
+
 
 def print_trace(trace: Any, detailed: bool = False, console: Console | None = None) -> None:
     """Print a trace report to the terminal using Rich.
@@ -43,7 +54,7 @@ def _print_dict_trace(trace: dict[str, Any], detailed: bool, console: Console) -
         step = node["step"]
         name = node["node_name"]
         duration = node["duration_ms"]
-        tree.add(f"[green]OK[/green] Step {step}: {name} ({duration:.1f}ms)")
+        tree.add(Text.assemble(_OK, f" Step {step}: {name} ({duration:.1f}ms)"))
 
     summary = f"[green]SUCCESS[/green] | {total_nodes} nodes | {total_ms:.1f}ms"
     panel = Panel(tree, title="[bold]agentrace[/bold]", subtitle=summary)
@@ -52,46 +63,48 @@ def _print_dict_trace(trace: dict[str, Any], detailed: bool, console: Console) -
 
 def _print_model_trace(trace: Any, detailed: bool, console: Console) -> None:
     """Render a Trace model object."""
-    from agentrace.core.models import NodeStatus
-
-    nodes = trace.nodes
+    cols = trace.node_columns
     meta = trace.metadata
     status_str = "[green]SUCCESS[/green]" if trace.successful else "[red]FAILED[/red]"
 
     tree = Tree("[bold]agentrace[/bold]")
-    for node in nodes:
-        if node.status == NodeStatus.SUCCESS:
-            icon = "[green]OK[/green]"
-        else:
-            icon = "[red]ERR[/red]"
-        label = f"{icon} Step {node.step}: {node.node_name} ({node.duration_ms:.1f}ms)"
-        node_branch = tree.add(label)
+    rows = zip(
+        cols.names, cols.steps, cols.statuses, cols.durations_ms, cols.errors, cols.state_diffs
+    )
+    for name, step, status, duration_ms, error, state_diff in rows:
+        icon = _STATUS_ICON.get(status, _ERR)
+        node_branch = tree.add(Text.assemble(icon, f" Step {step}: {name} ({duration_ms:.1f}ms)"))
 
-        if detailed and node.state_diff:
-            diff_str = json.dumps(node.state_diff, indent=2, default=str)
-            node_branch.add(f"[dim]diff: {diff_str}[/dim]")
+        if detailed and state_diff:
+            diff_str = json.dumps(state_diff, indent=2, default=str)
+            node_branch.add(Text(f"diff: {diff_str}", style="dim"))
 
-        if node.error:
-            node_branch.add(f"[red]error: {node.error}[/red]")
+        if error:
+            node_branch.add(Text(f"error: {error}", style="red"))
 
     summary = f"{status_str} | {meta.total_nodes} nodes | {meta.duration_ms:.1f}ms"
+    if meta.sampled_count:
+        summary += f" | sampled 1/{meta.sample_rate}, {meta.sampled_count} skipped"
     panel = Panel(tree, title="[bold]agentrace[/bold]", subtitle=summary)
     console.print(panel)
 
     if detailed:
+        from rich.table import Table
+
         table = Table(title="Node Timing")
         table.add_column("Step", justify="right")
         table.add_column("Node")
         table.add_column("Duration (ms)", justify="right")
         table.add_column("Status")
 
-        for node in nodes:
-            status = "[green]OK[/green]" if node.status == NodeStatus.SUCCESS else "[red]ERR[/red]"
+        for name, step, status, duration_ms in zip(
+            cols.names, cols.steps, cols.statuses, cols.durations_ms
+        ):
             table.add_row(
-                str(node.step),
-                node.node_name,
-                f"{node.duration_ms:.1f}",
-                status,
+                str(step),
+                name,
+                f"{duration_ms:.1f}",
+                _STATUS_CELL.get(status, _ERR_CELL),
             )
 
         console.print(table)
@@ -0,0 +1,26 @@
+"""Single-node test agent whose only node always raises.
+
+Graph: bad_node (raises ValueError("boom"))
+"""
+
+from typing import TypedDict
+
+from langgraph.graph import END, START, StateGraph
+
+
+class ErrorState(TypedDict):
+    v: str
+
+
+def bad_node(state: ErrorState) -> dict:
+    """Always fail, so the trace records one errored node."""
+    raise ValueError("boom")
+
+
+def create_error_agent():
+    """Create and compile the failing single-node test agent."""
+    builder = StateGraph(ErrorState)
+    builder.add_node("bad_node", bad_node)
+    builder.add_edge(START, "bad_node")
+    builder.add_edge("bad_node", END)
+    return builder.compile()
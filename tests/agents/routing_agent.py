@@ -1,5 +1,6 @@
 """Test agent with conditional routing for comprehensive testing."""
 
+import re
 from typing import TypedDict
 
 from langgraph.graph import END, START, StateGraph
@@ -12,14 +13,19 @@ class RoutingState(TypedDict):
     response: str
 
 
+# One case-insensitive scan of the query; the first keyword found wins.
+_CAT_RE = re.compile(r"(technical|general)", re.IGNORECASE)
+
+_ROUTES = {
+    "technical": "technical_handler",
+    "general": "general_handler",
+}
+
+
 def classifier(state: RoutingState) -> dict:
     """Classify query into a category."""
-    query = state["query"].lower()
-    if "technical" in query:
-        return {"category": "technical"}
-    elif "general" in query:
-        return {"category": "general"}
-    return {"category": "unknown"}
+    m = _CAT_RE.search(state["query"])
+    return {"category": m.group(1).lower() if m else "unknown"}
 
 
 def technical_handler(state: RoutingState) -> dict:
@@ -48,12 +54,7 @@ def fallback_handler(state: RoutingState) -> dict:
 
 def route_by_category(state: RoutingState) -> str:
     """Route to the appropriate handler based on category."""
-    category = state.get("category", "unknown")
-    if category == "technical":
-        return "technical_handler"
-    elif category == "general":
-        return "general_handler"
-    return "fallback_handler"
+    return _ROUTES.get(state.get("category", "unknown"), "fallback_handler")
 
 
 def create_routing_agent():
@@ -0,0 +1,59 @@
+"""Shared fixtures for the agentrace test suite."""
+
+import pytest
+import pytest_asyncio
+
+from agentrace import Trace, wrap
+from tests.agents.error_agent import create_error_agent
+from tests.agents.routing_agent import create_routing_agent
+from tests.agents.simple_agent import create_simple_agent
+
+
+# Compiled graphs are read-only, so each is built once per session. Every wrap()
+# returns a new TracedGraph, so each test or fixture wraps its own and no other
+# caller can overwrite its last_trace.
+@pytest.fixture(scope="session")
+def shared_simple_graph():
+    return create_simple_agent()
+
+
+@pytest.fixture(scope="session")
+def shared_routing_graph():
+    return create_routing_agent()
+
+
+@pytest.fixture(scope="session")
+def simple_trace(shared_simple_graph):
+    """A successful simple-agent trace, shared by every test that only reads it."""
+    traced = wrap(shared_simple_graph)
+    traced.invoke({"query": "test"})
+    return traced.last_trace
+
+
+@pytest.fixture(scope="session")
+def empty_trace():
+    """A default-constructed Trace; read-only, so one instance serves every test."""
+    return Trace()
+
+
+@pytest.fixture(scope="session")
+def error_graph():
+    return create_error_agent()
+
+
+@pytest.fixture
+def error_trace(error_graph):
+    """The partial trace left by a failed ``invoke`` of the error agent."""
+    traced = wrap(error_graph)
+    with pytest.raises(ValueError, match="boom"):
+        traced.invoke({"v": ""})
+    return traced.last_trace
+
+
+@pytest_asyncio.fixture
+async def async_error_trace(error_graph):
+    """The partial trace left by a failed ``ainvoke`` of the error agent."""
+    traced = wrap(error_graph)
+    with pytest.raises(ValueError, match="boom"):
+        await traced.ainvoke({"v": ""})
+    return traced.last_trace
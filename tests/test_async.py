@@ -1,15 +1,17 @@
 """Tests for async LangGraph support (ainvoke, astream)."""
 
+import asyncio
+
 import pytest
+import pytest_asyncio
 
 from agentrace import assertions, wrap
 from agentrace.core.models import NodeStatus
-from tests.agents.simple_agent import create_simple_agent
 
 
 @pytest.fixture
-def simple_graph():
-    return create_simple_agent()
+def simple_graph(shared_simple_graph):
+    return shared_simple_graph
 
 
 @pytest.fixture
@@ -17,6 +19,29 @@ def traced_simple(simple_graph):
     return wrap(simple_graph)
 
 
+# Queries for the read-only ainvoke tests below; each gets its own trace.
+_AINVOKE_QUERIES = [
+    "async trace",
+    "nodes",
+    "count",
+    "edges",
+    "assertions",
+    "order",
+    "no errors",
+    "status",
+    "metadata",
+    "state check",
+]
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def ainvoke_traces(shared_simple_graph):
+    """Run every read-only ainvoke query concurrently, once per module."""
+    tracers = [wrap(shared_simple_graph) for _ in _AINVOKE_QUERIES]
+    await asyncio.gather(*(t.ainvoke({"query": q}) for t, q in zip(tracers, _AINVOKE_QUERIES)))
+    return {q: t.last_trace for t, q in zip(tracers, _AINVOKE_QUERIES)}
+
+
 # ---------------------------------------------------------------------------
 # ainvoke tests
 # ---------------------------------------------------------------------------
@@ -28,75 +53,69 @@ async def test_ainvoke_returns_result(traced_simple):
     assert "async test" in result["response"].lower()
 
 
-async def test_ainvoke_captures_trace(traced_simple):
-    await traced_simple.ainvoke({"query": "async trace"})
-    trace = traced_simple.last_trace
+def test_ainvoke_captures_trace(ainvoke_traces):
+    trace = ainvoke_traces["async trace"]
     assert trace is not None
 
 
-async def test_ainvoke_trace_has_nodes(traced_simple):
-    await traced_simple.ainvoke({"query": "nodes"})
-    trace = traced_simple.last_trace
+def test_ainvoke_trace_has_nodes(ainvoke_traces):
+    trace = ainvoke_traces["nodes"]
     node_names = [n.node_name for n in trace.nodes]
     assert "retriever" in node_names
     assert "processor" in node_names
     assert "generator" in node_names
 
 
-async def test_ainvoke_trace_node_count(traced_simple):
-    await traced_simple.ainvoke({"query": "count"})
-    trace = traced_simple.last_trace
+def test_ainvoke_trace_node_count(ainvoke_traces):
+    trace = ainvoke_traces["count"]
     assert len(trace.nodes) == 3
 
 
-async def test_ainvoke_trace_edges(traced_simple):
-    await traced_simple.ainvoke({"query": "edges"})
-    trace = traced_simple.last_trace
+def test_ainvoke_trace_edges(ainvoke_traces):
+    trace = ainvoke_traces["edges"]
     assert len(trace.edges) >= 2
 
 
-async def test_ainvoke_assertions_node_visited(traced_simple):
-    await traced_simple.ainvoke({"query": "assertions"})
-    trace = traced_simple.last_trace
-    assertions.node_was_visited(trace, "retriever")
-    assertions.node_was_visited(trace, "processor")
-    assertions.node_was_visited(trace, "generator")
+def test_ainvoke_assertions_node_visited(ainvoke_traces):
+    trace = ainvoke_traces["assertions"]
+    assertions.all_nodes_visited(trace, {"retriever", "processor", "generator"})
 
 
-async def test_ainvoke_assertions_order(traced_simple):
-    await traced_simple.ainvoke({"query": "order"})
-    trace = traced_simple.last_trace
+def test_ainvoke_assertions_order(ainvoke_traces):
+    trace = ainvoke_traces["order"]
     assertions.node_visited_before(trace, "retriever", "generator")
     assertions.node_visited_before(trace, "processor", "generator")
 
 
-async def test_ainvoke_no_errors(traced_simple):
-    await traced_simple.ainvoke({"query": "no errors"})
-    trace = traced_simple.last_trace
+def test_ainvoke_no_errors(ainvoke_traces):
+    trace = ainvoke_traces["no errors"]
     assertions.no_errors(trace)
 
 
-async def test_ainvoke_node_status_success(traced_simple):
-    await traced_simple.ainvoke({"query": "status"})
-    trace = traced_simple.last_trace
+def test_ainvoke_node_status_success(ainvoke_traces):
+    trace = ainvoke_traces["status"]
     for node in trace.nodes:
         assert node.status == NodeStatus.SUCCESS
 
 
-async def test_ainvoke_metadata_populated(traced_simple):
-    await traced_simple.ainvoke({"query": "metadata"})
-    trace = traced_simple.last_trace
+def test_ainvoke_metadata_populated(ainvoke_traces):
+    trace = ainvoke_traces["metadata"]
     assert trace.metadata.run_id is not None
     assert trace.metadata.duration_ms > 0
     assert trace.metadata.total_nodes == 3
 
 
-async def test_ainvoke_state_at_node(traced_simple):
-    await traced_simple.ainvoke({"query": "state check"})
-    trace = traced_simple.last_trace
+def test_ainvoke_state_at_node(ainvoke_traces):
+    trace = ainvoke_traces["state check"]
     assertions.state_at_node(trace, "processor", lambda s: "documents" in s)
 
 
+def test_concurrent_ainvoke_traces_are_independent(ainvoke_traces):
+    for query, trace in ainvoke_traces.items():
+        assert trace.metadata.input_data == {"query": query}
+        assert trace.node_names == ["retriever", "processor", "generator"]
+
+
 async def test_ainvoke_multiple_sequential(traced_simple):
     """Each ainvoke should produce an independent trace."""
     await traced_simple.ainvoke({"query": "first"})
@@ -149,38 +168,32 @@ async def test_astream_assertions_node_visited(traced_simple):
     async for _ in traced_simple.astream({"query": "stream assertions"}):
         pass
     trace = traced_simple.last_trace
-    assertions.node_was_visited(trace, "retriever")
-    assertions.node_was_visited(trace, "generator")
+    assertions.all_nodes_visited(trace, {"retriever", "generator"})
 
 
 # ---------------------------------------------------------------------------
-# Error propagation
+# abatch tests
 # ---------------------------------------------------------------------------
 
 
-async def test_ainvoke_error_captured():
-    """If a node raises, the partial trace is still captured."""
-    from typing import TypedDict
-
-    from langgraph.graph import END, START, StateGraph
-
-    class ErrState(TypedDict):
-        value: int
+async def test_abatch_captures_one_trace_per_input(traced_simple):
+    results = await traced_simple.abatch([{"query": "one"}, {"query": "two"}])
+    assert len(results) == 2
+    traces = traced_simple.last_traces
+    assert [t.metadata.input_data["query"] for t in traces] == ["one", "two"]
+    for t in traces:
+        assertions.no_errors(t)
+        assert len(t.nodes) == 3
 
-    def bad_node(state: ErrState) -> dict:
-        raise ValueError("intentional failure")
 
-    builder = StateGraph(ErrState)
-    builder.add_node("bad_node", bad_node)
-    builder.add_edge(START, "bad_node")
-    builder.add_edge("bad_node", END)
-    graph = builder.compile()
+# ---------------------------------------------------------------------------
+# Error propagation
+# ---------------------------------------------------------------------------
 
-    traced = wrap(graph)
-    with pytest.raises(ValueError, match="intentional failure"):
-        await traced.ainvoke({"value": 1})
 
-    trace = traced.last_trace
+def test_ainvoke_error_captured(async_error_trace):
+    """If a node raises, the partial trace is still captured."""
+    trace = async_error_trace
     assert trace is not None
     error_nodes = [n for n in trace.nodes if n.status == NodeStatus.ERROR]
     assert len(error_nodes) == 1
@@ -1,17 +1,17 @@
 """Tests for agentrace capture, reporter, and assertions (PoC)."""
 
 import io
+import time
 
 import pytest
 from rich.console import Console
 
 from agentrace import assertions, capture, print_trace
-from tests.agents.simple_agent import create_simple_agent
 
 
 @pytest.fixture
-def agent():
-    return create_simple_agent()
+def agent(shared_simple_graph):
+    return shared_simple_graph
 
 
 @pytest.fixture
@@ -49,6 +49,19 @@ class TestCapture:
         assert "response" in trace["output"]
         assert trace["output"]["response"].startswith("Generated answer:")
 
+    def test_nodes_sharing_a_chunk_take_no_extra_time(self):
+        class OneChunkGraph:
+            """Stand-in graph whose two nodes arrive in a single updates chunk."""
+
+            def stream(self, input_data, stream_mode):
+                time.sleep(0.002)
+                yield {"left": {"l": 1}, "right": {"r": 2}}
+
+        left, right = capture(OneChunkGraph(), {"q": "x"})["nodes"]
+        assert left["duration_ms"] > 0
+        assert right["duration_ms"] == 0.0
+        assert right["timestamp_start"] == right["timestamp_end"] == left["timestamp_end"]
+
     def test_input_preserved(self, trace):
         assert trace["input"] == {"query": "test query"}
 
@@ -72,6 +85,17 @@ class TestAssertions:
         assertions.node_was_visited(trace, "processor")
         assertions.node_was_visited(trace, "generator")
 
+    def test_all_nodes_visited_passes(self, trace):
+        assertions.all_nodes_visited(trace, {"retriever", "processor", "generator"})
+
+    def test_all_nodes_visited_reports_every_missing_node(self, trace):
+        with pytest.raises(AssertionError, match=r"\['a', 'b'\] were NOT visited"):
+            assertions.all_nodes_visited(trace, {"retriever", "b", "a"})
+
+    def test_all_nodes_visited_rejects_a_single_name(self, trace):
+        with pytest.raises(TypeError, match="node_was_visited"):
+            assertions.all_nodes_visited(trace, "retriever")
+
     def test_node_was_visited_fails_for_missing_node(self, trace):
         with pytest.raises(AssertionError, match="NOT visited"):
             assertions.node_was_visited(trace, "nonexistent_node")
@@ -79,3 +103,36 @@ class TestAssertions:
     def test_node_was_visited_error_shows_visited_nodes(self, trace):
         with pytest.raises(AssertionError, match="retriever"):
             assertions.node_was_visited(trace, "missing")
+
+    def test_node_visited_before_passes(self, trace):
+        assertions.node_visited_before(trace, "retriever", "generator")
+
+    def test_node_visited_before_wrong_order(self, trace):
+        with pytest.raises(AssertionError, match="NOT visited before"):
+            assertions.node_visited_before(trace, "generator", "retriever")
+
+    def test_node_visited_before_missing_node(self, trace):
+        with pytest.raises(AssertionError, match="'missing' was NOT visited"):
+            assertions.node_visited_before(trace, "retriever", "missing")
+
+    def test_no_errors_on_dict_trace(self, trace):
+        assertions.no_errors(trace)
+        failed = {**trace, "nodes": [*trace["nodes"], {"node_name": "bad", "status": "error"}]}
+        with pytest.raises(AssertionError, match=r"\['bad'\]"):
+            assertions.no_errors(failed)
+
+    def test_edge_taken_derived_from_node_order(self, trace):
+        assertions.edge_taken(trace, "retriever", "processor")
+        with pytest.raises(AssertionError, match="NOT taken"):
+            assertions.edge_taken(trace, "retriever", "generator")
+
+
+class TestCaptureDisabled:
+    def test_disabled_returns_output_without_nodes(self, agent, monkeypatch):
+        from agentrace.core import config
+
+        monkeypatch.setattr(config, "TRACING_DISABLED", True)
+        trace = capture(agent, {"query": "off"})
+        assert trace["nodes"] == []
+        assert trace["node_names"] == []
+        assert trace["output"]["response"].startswith("Generated answer:")
@@ -3,139 +3,100 @@
 Tests conditional routing, all assertions, all reporters, error scenarios.
 """
 
+import io
 import json
 
 import pytest
 from rich.console import Console
 
 from agentrace import Trace, assertions, capture, print_trace, to_mermaid, wrap
-from agentrace.core.differ import compute_state_diff
+from agentrace.core.differ import compute_state_diff, compute_update_diff
 from agentrace.core.models import EdgeTransition, NodeExecution, NodeStatus, RunMetadata
-from tests.agents.routing_agent import create_routing_agent
-from tests.agents.simple_agent import create_simple_agent
 
 # ---------------------------------------------------------------------------
 # Conditional routing agent tests
 # ---------------------------------------------------------------------------
 
 
+def _routing_trace(graph, query):
+    traced = wrap(graph)
+    traced.invoke({"query": query, "category": "", "documents": [], "response": ""})
+    return traced.last_trace
+
+
+# Each route is invoked once per class; the tests only read the trace.
+@pytest.fixture(scope="class")
+def routing_technical_trace(shared_routing_graph):
+    return _routing_trace(shared_routing_graph, "technical question")
+
+
+@pytest.fixture(scope="class")
+def routing_general_trace(shared_routing_graph):
+    return _routing_trace(shared_routing_graph, "general question")
+
+
+@pytest.fixture(scope="class")
+def routing_fallback_trace(shared_routing_graph):
+    return _routing_trace(shared_routing_graph, "random stuff")
+
+
 class TestConditionalRouting:
-    def test_technical_route(self):
-        graph = create_routing_agent()
-        traced = wrap(graph)
-        result = traced.invoke(
-            {
-                "query": "technical question",
-                "category": "",
-                "documents": [],
-                "response": "",
-            }
-        )
-        trace = traced.last_trace
-        assert trace is not None
-        assertions.node_was_visited(trace, "classifier")
-        assertions.node_was_visited(trace, "technical_handler")
-        assertions.node_was_not_visited(trace, "general_handler")
-        assertions.node_was_not_visited(trace, "fallback_handler")
-        assertions.node_visited_before(trace, "classifier", "technical_handler")
-        assert result["category"] == "technical"
-
-    def test_general_route(self):
-        graph = create_routing_agent()
-        traced = wrap(graph)
-        traced.invoke(
-            {
-                "query": "general question",
-                "category": "",
-                "documents": [],
-                "response": "",
-            }
-        )
-        trace = traced.last_trace
-        assertions.node_was_visited(trace, "general_handler")
-        assertions.node_was_not_visited(trace, "technical_handler")
-        assertions.edge_taken(trace, "classifier", "general_handler")
-
-    def test_fallback_route(self):
-        graph = create_routing_agent()
-        traced = wrap(graph)
-        traced.invoke(
-            {
-                "query": "random stuff",
-                "category": "",
-                "documents": [],
-                "response": "",
-            }
-        )
-        trace = traced.last_trace
-        assertions.node_was_visited(trace, "fallback_handler")
-        assertions.node_was_not_visited(trace, "technical_handler")
-        assertions.node_was_not_visited(trace, "general_handler")
-
-    def test_routing_total_nodes(self):
-        graph = create_routing_agent()
-        traced = wrap(graph)
-        traced.invoke(
-            {
-                "query": "technical",
-                "category": "",
-                "documents": [],
-                "response": "",
-            }
-        )
-        trace = traced.last_trace
+    @pytest.mark.parametrize(
+        "trace_fixture,category,expected,forbidden",
+        [
+            (
+                "routing_technical_trace",
+                "technical",
+                "technical_handler",
+                ["general_handler", "fallback_handler"],
+            ),
+            ("routing_general_trace", "general", "general_handler", ["technical_handler"]),
+            (
+                "routing_fallback_trace",
+                "unknown",
+                "fallback_handler",
+                ["technical_handler", "general_handler"],
+            ),
+        ],
+    )
+    def test_route(self, request, trace_fixture, category, expected, forbidden):
+        # Routes share the class-scoped traces instead of invoking per case
+        trace = request.getfixturevalue(trace_fixture)
+        assertions.all_nodes_visited(trace, {"classifier", expected})
+        for node in forbidden:
+            assertions.node_was_not_visited(trace, node)
+        assertions.node_visited_before(trace, "classifier", expected)
+        assertions.edge_taken(trace, "classifier", expected)
+        assert trace.metadata.output_data["category"] == category
+
+    def test_routing_total_nodes(self, routing_technical_trace):
         # Conditional edges may cause duplicate node events
-        assertions.total_nodes_visited(trace, min=2)
+        assertions.total_nodes_visited(routing_technical_trace, min=2)
 
-    def test_routing_mermaid(self):
-        graph = create_routing_agent()
-        traced = wrap(graph)
-        traced.invoke(
-            {
-                "query": "technical",
-                "category": "",
-                "documents": [],
-                "response": "",
-            }
-        )
-        mermaid = to_mermaid(traced.last_trace)
+    def test_routing_mermaid(self, routing_technical_trace):
+        mermaid = to_mermaid(routing_technical_trace)
         assert "classifier" in mermaid
         assert "technical_handler" in mermaid
 
-    def test_routing_state_at_node(self):
-        graph = create_routing_agent()
-        traced = wrap(graph)
-        traced.invoke(
-            {
-                "query": "technical question",
-                "category": "",
-                "documents": [],
-                "response": "",
-            }
-        )
-        trace = traced.last_trace
+    def test_routing_state_at_node(self, routing_technical_trace):
         # Check the technical_handler output state instead (classifier's
         # state_after may not reflect its output due to callback ordering)
         assertions.state_at_node(
-            trace,
+            routing_technical_trace,
             "technical_handler",
             lambda s: "technical" in s.get("response", ""),
         )
 
-    def test_routing_rich_report(self):
-        graph = create_routing_agent()
-        traced = wrap(graph)
-        traced.invoke(
-            {
-                "query": "technical",
-                "category": "",
-                "documents": [],
-                "response": "",
-            }
+    def test_routing_rich_report(self, routing_technical_trace):
+        # Render to a plain in-memory sink: no ANSI styling work. The detailed
+        # report includes the summary tree, so one render covers both.
+        console = Console(
+            file=io.StringIO(), force_terminal=False, width=120, no_color=True, highlight=False
         )
-        console = Console(file=None, force_terminal=True, width=120)
-        print_trace(traced.last_trace, console=console)
-        print_trace(traced.last_trace, detailed=True, console=console)
+        print_trace(routing_technical_trace, detailed=True, console=console)
+        output = console.file.getvalue()
+        assert "technical_handler" in output
+        assert "Node Timing" in output
 
 
 # ---------------------------------------------------------------------------
@@ -144,38 +105,24 @@ class TestConditionalRouting:
 
 
 class TestAssertionEdgeCases:
-    def test_node_visited_before_same_node(self):
-        graph = create_simple_agent()
-        traced = wrap(graph)
-        traced.invoke({"query": "test"})
-        trace = traced.last_trace
+    def test_node_visited_before_same_node(self, simple_trace):
         # Same node: idx_a >= idx_b should fail
         with pytest.raises(AssertionError, match="NOT visited before"):
-            assertions.node_visited_before(trace, "retriever", "retriever")
+            assertions.node_visited_before(simple_trace, "retriever", "retriever")
 
-    def test_edge_taken_nonexistent_edge(self):
-        graph = create_simple_agent()
-        traced = wrap(graph)
-        traced.invoke({"query": "test"})
-        trace = traced.last_trace
+    def test_edge_taken_nonexistent_edge(self, simple_trace):
         with pytest.raises(AssertionError, match="NOT taken"):
-            assertions.edge_taken(trace, "generator", "retriever")
+            assertions.edge_taken(simple_trace, "generator", "retriever")
 
-    def test_total_nodes_no_constraints(self):
-        graph = create_simple_agent()
-        traced = wrap(graph)
-        traced.invoke({"query": "test"})
+    def test_total_nodes_no_constraints(self, simple_trace):
         # No min/max - should always pass
-        assertions.total_nodes_visited(traced.last_trace)
+        assertions.total_nodes_visited(simple_trace)
 
-    def test_state_at_node_predicate_exception(self):
-        graph = create_simple_agent()
-        traced = wrap(graph)
-        traced.invoke({"query": "test"})
+    def test_state_at_node_predicate_exception(self, simple_trace):
         # Predicate that raises should propagate
         with pytest.raises(KeyError):
             assertions.state_at_node(
-                traced.last_trace,
+                simple_trace,
                 "retriever",
                 lambda s: s["nonexistent_key"],
             )
@@ -198,6 +145,26 @@ class TestDifferEdgeCases:
         assert diff is not None
         assert "changed" in diff
 
+    def test_nested_change_uses_dotted_path(self):
+        diff = compute_state_diff(
+            {"a": {"b": 1, "c": 1}},
+            {"a": {"b": 2, "c": 1, "d": 3}},
+        )
+        assert diff == {
+            "added": {"a.d": 3},
+            "changed": {"a.b": {"old": 1, "new": 2}},
+        }
+
+    def test_update_diff_matches_full_diff(self):
+        before = {"q": "x", "docs": [1], "cfg": {"a": 1, "b": 2}}
+        update = {"docs": [1, 2], "cfg": {"a": 1}, "new": True, "q": "x"}
+        assert compute_update_diff(before, update) == compute_state_diff(
+            before, {**before, **update}
+        )
+
+    def test_update_diff_ignores_untouched_keys(self):
+        assert compute_update_diff({"a": 1, "b": 2}, {"a": 1}) is None
+
     def test_list_addition(self):
         diff = compute_state_diff(
             {"items": [1, 2]},
@@ -220,22 +187,20 @@ class TestDifferEdgeCases:
 
 
 class TestSerializationEdgeCases:
-    def test_trace_roundtrip(self):
-        graph = create_simple_agent()
-        traced = wrap(graph)
-        traced.invoke({"query": "test"})
-        trace = traced.last_trace
-        json_str = trace.model_dump_json()
-        loaded = Trace.model_validate_json(json_str)
+    def test_trace_roundtrip(self, simple_trace):
+        trace = simple_trace
+        # Schema round-trip only; JSON text is covered separately below
+        loaded = Trace.model_validate(trace.model_dump(mode="json"))
         assert loaded.node_names == trace.node_names
         assert loaded.successful == trace.successful
         assert len(loaded.edges) == len(trace.edges)
 
-    def test_trace_model_dump_structure(self):
-        graph = create_simple_agent()
-        traced = wrap(graph)
-        traced.invoke({"query": "test"})
-        data = traced.last_trace.model_dump()
+    def test_trace_model_dump_json_is_valid_json(self, simple_trace):
+        data = json.loads(simple_trace.model_dump_json())
+        assert data == simple_trace.model_dump(mode="json")
+
+    def test_trace_model_dump_structure(self, simple_trace):
+        data = simple_trace.model_dump()
         # Check nested structure
         assert isinstance(data["metadata"], dict)
         assert "run_id" in data["metadata"]
@@ -245,8 +210,8 @@ class TestSerializationEdgeCases:
             assert "status" in node
             assert "duration_ms" in node
 
-    def test_empty_trace_serialization(self):
-        trace = Trace()
+    def test_empty_trace_serialization(self, empty_trace):
+        trace = empty_trace
         data = json.loads(trace.model_dump_json())
         assert data["nodes"] == []
         assert data["edges"] == []
@@ -274,6 +239,12 @@ class TestModelConstruction:
         assert node.status == NodeStatus.ERROR
         assert node.error == "something went wrong"
 
+    def test_node_execution_keeps_state_by_reference(self):
+        state = {"documents": ["a", "b"]}
+        node = NodeExecution(node_name="n", step=1, state_before=state, state_after=state)
+        assert node.state_before is state
+        assert node.state_after is state
+
     def test_edge_transition(self):
         edge = EdgeTransition(from_node="a", to_node="b", step=1)
         assert edge.from_node == "a"
@@ -285,15 +256,14 @@ class TestModelConstruction:
         assert meta.total_nodes == 0
         assert meta.error_count == 0
 
-    def test_trace_properties_empty(self):
-        trace = Trace()
+    def test_trace_properties_empty(self, empty_trace):
+        trace = empty_trace
         assert trace.node_names == []
         assert trace.successful is True
         assert trace.get_node("any") is None
 
-    def test_trace_to_mermaid(self):
-        graph = create_simple_agent()
-        traced = wrap(graph)
+    def test_trace_to_mermaid(self, shared_simple_graph):
+        traced = wrap(shared_simple_graph)
         traced.invoke({"query": "test"})
         mermaid = traced.last_trace.to_mermaid(direction="LR")
         assert "graph LR" in mermaid
@@ -305,9 +275,8 @@ class TestModelConstruction:
 
 
 class TestStreamMode:
-    def test_stream_with_routing_agent(self):
-        graph = create_routing_agent()
-        traced = wrap(graph)
+    def test_stream_with_routing_agent(self, shared_routing_graph):
+        traced = wrap(shared_routing_graph)
         chunks = list(
             traced.stream(
                 {
@@ -320,13 +289,12 @@ class TestStreamMode:
         )
         assert len(chunks) > 0
         trace = traced.last_trace
-        assert isinstance(trace, Trace)
+        assert type(trace) is Trace
         assertions.node_was_visited(trace, "classifier")
 
-    def test_legacy_capture_with_routing_agent(self):
-        graph = create_routing_agent()
+    def test_legacy_capture_with_routing_agent(self, shared_routing_graph):
         result = capture(
-            graph,
+            shared_routing_graph,
             {
                 "query": "general info",
                 "category": "",
@@ -344,33 +312,13 @@ class TestStreamMode:
 
 
 class TestMermaidEdgeCases:
-    def test_empty_trace_mermaid(self):
-        trace = Trace()
+    def test_empty_trace_mermaid(self, empty_trace):
+        trace = empty_trace
         mermaid = to_mermaid(trace)
         assert "graph TD" in mermaid
         # No START/END connections since no nodes
         assert "START" in mermaid
 
-    def test_mermaid_with_error_trace(self):
-        from typing import TypedDict
-
-        from langgraph.graph import END, START, StateGraph
-
-        class S(TypedDict):
-            v: str
-
-        def bad(state: S) -> dict:
-            raise ValueError("fail")
-
-        builder = StateGraph(S)
-        builder.add_node("bad", bad)
-        builder.add_edge(START, "bad")
-        builder.add_edge("bad", END)
-        graph = builder.compile()
-        traced = wrap(graph)
-
-        with pytest.raises(ValueError):
-            traced.invoke({"v": ""})
-
-        mermaid = to_mermaid(traced.last_trace)
+    def test_mermaid_with_error_trace(self, error_trace):
+        mermaid = to_mermaid(error_trace)
         assert "#dc3545" in mermaid  # error red
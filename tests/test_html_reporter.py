@@ -1,112 +1,142 @@
 """Tests for the HTML reporter."""
 
-import os
-import tempfile
-
 import pytest
 
 from agentrace import capture, to_html, wrap
-from tests.agents.routing_agent import create_routing_agent
-from tests.agents.simple_agent import create_simple_agent
+from agentrace.reporters.html import iter_html, write_html
 
 
 @pytest.fixture
-def trace():
-    graph = create_simple_agent()
-    traced = wrap(graph)
-    traced.invoke({"query": "test"})
-    return traced.last_trace
+def trace(simple_trace):
+    return simple_trace
+
+
+@pytest.fixture(scope="module")
+def html(simple_trace):
+    """One rendered report shared by the read-only content checks."""
+    return to_html(simple_trace)
 
 
 class TestHtmlReporter:
-    def test_generates_html_string(self, trace):
-        html = to_html(trace)
+    def test_generates_html_string(self, html):
         assert "<!DOCTYPE html>" in html
         assert "agentrace Report" in html
 
-    def test_contains_node_names(self, trace):
-        html = to_html(trace)
+    def test_contains_node_names(self, html):
         assert "retriever" in html
         assert "processor" in html
         assert "generator" in html
 
-    def test_contains_mermaid(self, trace):
-        html = to_html(trace)
+    def test_contains_mermaid(self, html):
         assert "mermaid" in html
         assert "graph TD" in html
 
-    def test_contains_stats(self, trace):
-        html = to_html(trace)
+    def test_contains_stats(self, html):
         assert "SUCCESS" in html
         assert "Nodes Visited" in html
         assert "Total Duration" in html
 
-    def test_contains_node_cards(self, trace):
-        html = to_html(trace)
+    def test_contains_node_cards(self, html):
         assert "node-card" in html
         assert "Step 1" in html
 
-    def test_writes_to_file(self, trace):
-        with tempfile.NamedTemporaryFile(suffix=".html", delete=False) as f:
-            path = f.name
-        try:
-            to_html(trace, output_path=path)
-            assert os.path.exists(path)
-            with open(path) as f:
-                content = f.read()
-            assert "agentrace Report" in content
-        finally:
-            os.unlink(path)
+    def test_writes_to_file(self, trace, tmp_path):
+        path = tmp_path / "out.html"
+        to_html(trace, output_path=str(path))
+        assert path.exists()
+        assert "agentrace Report" in path.read_text()
 
-    def test_trace_to_html_method(self, trace):
-        html = trace.to_html()
-        assert "<!DOCTYPE html>" in html
-        assert "retriever" in html
+    def test_iter_html_chunks_join_to_report(self, trace):
+        chunks = list(iter_html(trace))
+        assert chunks[0].startswith("<!DOCTYPE html>")
+        assert chunks[0].rstrip().endswith("<h2>Node Details</h2>")
+        assert chunks[-1].rstrip().endswith("</html>")
+        assert "".join(chunks) == to_html(trace)
 
-    def test_trace_to_html_writes_file(self, trace):
-        with tempfile.NamedTemporaryFile(suffix=".html", delete=False) as f:
-            path = f.name
-        try:
-            trace.to_html(output_path=path)
-            assert os.path.exists(path)
-        finally:
-            os.unlink(path)
+    def test_pre_parsed_head_matches_format(self):
+        from agentrace.reporters.html import _HTML_HEAD, _render_head
 
-    def test_error_trace_html(self):
-        from typing import TypedDict
+        fields = ["status_text", "status_label", "status_class", "node_count"]
+        fields += ["total_duration", "error_count", "error_class", "mermaid_code"]
+        values = {f: f"<{f}>" for f in fields}
+        assert _render_head(values) == _HTML_HEAD.format(**values)
 
-        from langgraph.graph import END, START, StateGraph
+    def test_shared_state_snapshots_encoded_once(self, trace, monkeypatch):
+        import agentrace.reporters.html as html_module
 
-        class S(TypedDict):
-            v: str
+        encoded = []
+        real_dumps = html_module._json_dumps
 
-        def bad(state: S) -> dict:
-            raise ValueError("boom")
+        def counting_dumps(obj):
+            encoded.append(obj)
+            return real_dumps(obj)
 
-        builder = StateGraph(S)
-        builder.add_node("bad", bad)
-        builder.add_edge(START, "bad")
-        builder.add_edge("bad", END)
-        graph = builder.compile()
+        monkeypatch.setattr(html_module, "_json_dumps", counting_dumps)
+        to_html(trace)
+        # 3 diffs + 4 distinct snapshots (input, then one per node)
+        assert len(encoded) == 7
 
-        traced = wrap(graph)
-        with pytest.raises(ValueError):
-            traced.invoke({"v": ""})
+    def test_encoder_cache_is_bounded(self):
+        from agentrace.reporters.html import _DUMPS_CACHE_SIZE, _make_dumps
 
-        html = to_html(traced.last_trace)
+        dumps = _make_dumps()
+        states = [{"i": i} for i in range(_DUMPS_CACHE_SIZE + 1)]
+        texts = [dumps(s) for s in states]
+        assert dumps(states[-1]) is texts[-1]
+        assert dumps(states[0]) is not texts[0]
+        assert dumps(states[0]) == texts[0]
+
+    def test_written_file_matches_returned_html(self, trace, tmp_path):
+        path = tmp_path / "report.html"
+        html = to_html(trace, output_path=str(path))
+        assert path.read_text(encoding="utf-8") == html
+
+    def test_write_html_streams_chunks_to_file(self, trace, tmp_path, monkeypatch):
+        import agentrace.reporters.html as html_module
+
+        written = []
+        real_write_chunks = html_module.write_chunks
+
+        def recording_write_chunks(path, chunks):
+            # The chunks are handed over lazily, not as a pre-built list
+            assert not isinstance(chunks, (list, tuple))
+
+            def record():
+                for chunk in chunks:
+                    written.append(chunk)
+                    yield chunk
+
+            real_write_chunks(path, record())
+
+        monkeypatch.setattr(html_module, "write_chunks", recording_write_chunks)
+        path = tmp_path / "stream.html"
+        assert write_html(trace, str(path)) is None
+        assert written[-1] is html_module._HTML_TAIL_BYTES
+        assert path.read_text(encoding="utf-8") == to_html(trace)
+
+    def test_trace_to_html_method(self, trace):
+        html = trace.to_html()
+        assert "<!DOCTYPE html>" in html
+        assert "retriever" in html
+
+    def test_trace_to_html_writes_file(self, trace, tmp_path):
+        path = tmp_path / "out.html"
+        trace.to_html(output_path=str(path))
+        assert path.exists()
+
+    def test_error_trace_html(self, error_trace):
+        html = to_html(error_trace)
         assert "FAILED" in html
         assert "boom" in html
 
-    def test_dict_trace_html(self):
-        graph = create_simple_agent()
-        dict_trace = capture(graph, {"query": "test"})
+    def test_dict_trace_html(self, shared_simple_graph):
+        dict_trace = capture(shared_simple_graph, {"query": "test"})
         html = to_html(dict_trace)
         assert "<!DOCTYPE html>" in html
         assert "retriever" in html
 
-    def test_routing_agent_html(self):
-        graph = create_routing_agent()
-        traced = wrap(graph)
+    def test_routing_agent_html(self, shared_routing_graph):
+        traced = wrap(shared_routing_graph)
         traced.invoke(
             {
                 "query": "technical question",
@@ -1,22 +1,23 @@
 """Tests for JSON and JUnit XML reporters."""
 
 import json
-import os
-import tempfile
 import xml.etree.ElementTree as ET
+from datetime import date, datetime
+from enum import Enum
 
 import pytest
 
-from agentrace import capture, to_json, to_junit_xml, wrap
-from tests.agents.simple_agent import create_simple_agent
+from agentrace import capture, to_json, to_junit_xml
+from agentrace.core.models import NodeStatus
+
+
+class _Color(Enum):
+    RED = 1
 
 
 @pytest.fixture
-def trace():
-    graph = create_simple_agent()
-    traced = wrap(graph)
-    traced.invoke({"query": "test"})
-    return traced.last_trace
+def trace(simple_trace):
+    return simple_trace
 
 
 # ---------------------------------------------------------------------------
@@ -31,35 +32,90 @@ class TestJsonReporter:
         assert "nodes" in data
         assert "metadata" in data
 
-    def test_writes_to_file(self, trace):
-        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
-            path = f.name
-        try:
-            to_json(trace, output_path=path)
-            assert os.path.exists(path)
-            with open(path) as f:
-                data = json.load(f)
-            assert len(data["nodes"]) == 3
-        finally:
-            os.unlink(path)
-
-    def test_dict_trace_json(self):
-        graph = create_simple_agent()
-        dict_trace = capture(graph, {"query": "test"})
+    def test_writes_to_file(self, trace, tmp_path):
+        path = tmp_path / "out.json"
+        to_json(trace, output_path=str(path))
+        data = json.loads(path.read_bytes())
+        assert len(data["nodes"]) == 3
+
+    def test_file_matches_returned_string(self, trace, tmp_path):
+        path = tmp_path / "trace.json"
+        result = to_json(trace, output_path=str(path))
+        assert path.read_text(encoding="utf-8") == result
+        assert result == trace.model_dump_json(indent=2)
+
+    def test_dict_trace_json(self, shared_simple_graph):
+        dict_trace = capture(shared_simple_graph, {"query": "test"})
         result = to_json(dict_trace)
         data = json.loads(result)
         assert "node_names" in data
 
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_dumps_matches_stdlib_layout(self, monkeypatch, use_orjson):
+        from agentrace.reporters import json_reporter
+
+        if not use_orjson:
+            monkeypatch.setattr(json_reporter, "orjson", None)
+        elif json_reporter.orjson is None:
+            pytest.skip("orjson not installed")
+        value = {"a": [1, 2.5, None], "b": {"c": "d"}, 3: object}
+        expected = json.dumps(value, indent=2, default=str)
+        assert json_reporter.dumps(value) == expected
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            {"nan": float("nan"), "inf": [float("inf"), None]},
+            {"at": datetime(2024, 1, 1), "on": date(2024, 1, 1)},
+            {"c": _Color.RED, "nested": [{"c": _Color.RED}], "status": NodeStatus.SUCCESS},
+        ],
+        ids=["non_finite", "datetime", "enum"],
+    )
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_dumps_matches_stdlib_values(self, monkeypatch, use_orjson, value):
+        from agentrace.reporters import json_reporter
+
+        if not use_orjson:
+            monkeypatch.setattr(json_reporter, "orjson", None)
+        elif json_reporter.orjson is None:
+            pytest.skip("orjson not installed")
+        assert json_reporter.dumps(value) == json.dumps(value, indent=2, default=str)
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_dumps_round_trips_non_ascii(self, monkeypatch, use_orjson):
+        from agentrace.reporters import json_reporter
+
+        if not use_orjson:
+            monkeypatch.setattr(json_reporter, "orjson", None)
+        elif json_reporter.orjson is None:
+            pytest.skip("orjson not installed")
+        value = {"q": "héllo → wörld ✓"}
+        # orjson writes UTF-8 where the stdlib escapes; both decode to the same value
+        assert json.loads(json_reporter.dumps(value)) == value
+
+    def test_dumps_falls_back_on_unsupported_values(self):
+        from agentrace.reporters.json_reporter import dumps
+
+        assert json.loads(dumps({"big": 2**70})) == {"big": 2**70}
+
+    def test_chunked_writer_round_trips_unicode(self, tmp_path):
+        from agentrace.reporters._output import iter_slices, write_chunks
+
+        text = "héllo → wörld ✓ " * 50
+        path = tmp_path / "out.txt"
+        write_chunks(str(path), iter_slices(text, size=7))
+        assert path.read_text(encoding="utf-8") == text
+
     def test_trace_to_json_method(self, trace):
         result = trace.to_json()
         data = json.loads(result)
         assert data["nodes"][0]["node_name"] == "retriever"
 
     def test_custom_indent(self, trace):
-        compact = to_json(trace, indent=0)
+        # One serialization: top-level keys sit at exactly the requested indent
         indented = to_json(trace, indent=4)
-        # indented version should be longer due to whitespace
-        assert len(indented) > len(compact)
+        assert '\n    "nodes": [' in indented
+        assert '\n  "nodes"' not in indented
 
 
 # ---------------------------------------------------------------------------
@@ -94,46 +150,27 @@ class TestJunitReporter:
         assert "processor" in names
         assert "generator" in names
 
-    def test_writes_to_file(self, trace):
-        with tempfile.NamedTemporaryFile(suffix=".xml", delete=False) as f:
-            path = f.name
-        try:
-            to_junit_xml(trace, output_path=path)
-            assert os.path.exists(path)
-            tree = ET.parse(path)
-            root = tree.getroot()
-            assert root.tag == "testsuites"
-        finally:
-            os.unlink(path)
-
-    def test_error_trace_junit(self):
-        from typing import TypedDict
-
-        from langgraph.graph import END, START, StateGraph
-
-        class S(TypedDict):
-            v: str
-
-        def bad(state: S) -> dict:
-            raise RuntimeError("fail")
-
-        builder = StateGraph(S)
-        builder.add_node("bad", bad)
-        builder.add_edge(START, "bad")
-        builder.add_edge("bad", END)
-        graph = builder.compile()
-
-        traced = wrap(graph)
-        with pytest.raises(RuntimeError):
-            traced.invoke({"v": ""})
+    def test_compact_by_default_pretty_on_request(self, trace):
+        compact = to_junit_xml(trace)
+        pretty = to_junit_xml(trace, pretty=True)
+        assert compact.count("\n") == 1  # only after the declaration
+        assert "\n    <testcase" in pretty
+        assert ET.canonicalize(compact, strip_text=True) == ET.canonicalize(pretty, strip_text=True)
+
+    def test_writes_to_file(self, trace, tmp_path):
+        path = tmp_path / "out.xml"
+        to_junit_xml(trace, output_path=str(path))
+        root = ET.fromstring(path.read_text(encoding="utf-8"))
+        assert root.tag == "testsuites"
 
-        xml_str = to_junit_xml(traced.last_trace)
+    def test_error_trace_junit(self, error_trace):
+        xml_str = to_junit_xml(error_trace)
         root = ET.fromstring(xml_str)
         suite = root.find("testsuite")
         assert suite.get("errors") == "1"
         error_case = suite.find(".//error")
         assert error_case is not None
-        assert "fail" in error_case.get("message", "")
+        assert "boom" in error_case.get("message", "")
 
     def test_trace_to_junit_method(self, trace):
         xml_str = trace.to_junit_xml()
@@ -141,9 +178,8 @@ class TestJunitReporter:
         root = ET.fromstring(xml_str)
         assert root.find("testsuite") is not None
 
-    def test_dict_trace_junit(self):
-        graph = create_simple_agent()
-        dict_trace = capture(graph, {"query": "test"})
+    def test_dict_trace_junit(self, shared_simple_graph):
+        dict_trace = capture(shared_simple_graph, {"query": "test"})
         xml_str = to_junit_xml(dict_trace)
         root = ET.fromstring(xml_str)
         assert root.find("testsuite").get("tests") == "3"
@@ -4,58 +4,53 @@ import pytest
 
 from agentrace import assertions
 from agentrace.core.models import Trace
-from tests.agents.simple_agent import create_simple_agent
+
+
+@pytest.fixture
+def invoked_traced(traced_agent, shared_simple_graph):
+    """A graph wrapped by the plugin fixture and invoked once."""
+    traced = traced_agent(shared_simple_graph)
+    traced.invoke({"query": "test"})
+    return traced
 
 
 class TestTracedAgentFixture:
-    def test_traced_agent_returns_traced_graph(self, traced_agent):
-        graph = create_simple_agent()
-        traced = traced_agent(graph)
+    def test_traced_agent_returns_traced_graph(self, traced_agent, shared_simple_graph):
+        traced = traced_agent(shared_simple_graph)
         assert hasattr(traced, "invoke")
         assert hasattr(traced, "last_trace")
 
-    def test_traced_agent_invoke_produces_trace(self, traced_agent):
-        graph = create_simple_agent()
-        traced = traced_agent(graph)
+    def test_traced_agent_invoke_produces_trace(self, traced_agent, shared_simple_graph):
+        traced = traced_agent(shared_simple_graph)
         result = traced.invoke({"query": "test"})
         assert "response" in result
         trace = traced.last_trace
-        assert isinstance(trace, Trace)
+        assert type(trace) is Trace
         assert trace.node_names == ["retriever", "processor", "generator"]
 
-    def test_traced_agent_with_assertions(self, traced_agent):
-        graph = create_simple_agent()
-        traced = traced_agent(graph)
-        traced.invoke({"query": "hello"})
-        trace = traced.last_trace
-        assertions.node_was_visited(trace, "retriever")
+    def test_traced_agent_with_assertions(self, invoked_traced):
+        trace = invoked_traced.last_trace
+        assertions.all_nodes_visited(trace, ("retriever", "processor", "generator"))
         assertions.no_errors(trace)
         assertions.total_nodes_visited(trace, min=3, max=3)
 
-    def test_traced_agent_multiple_graphs(self, traced_agent):
-        g1 = create_simple_agent()
-        g2 = create_simple_agent()
-        t1 = traced_agent(g1)
-        t2 = traced_agent(g2)
+    def test_traced_agent_multiple_graphs(self, traced_agent, shared_simple_graph):
+        t1 = traced_agent(shared_simple_graph)
+        t2 = traced_agent(shared_simple_graph)
+        assert t1 is not t2
         t1.invoke({"query": "q1"})
         t2.invoke({"query": "q2"})
-        assert t1.last_trace is not None
-        assert t2.last_trace is not None
+        assert t1.last_trace.metadata.input_data == {"query": "q1"}
+        assert t2.last_trace.metadata.input_data == {"query": "q2"}
 
 
 class TestAgentraceReportFixture:
-    def test_report_collects_trace(self, traced_agent, agentrace_report):
-        graph = create_simple_agent()
-        traced = traced_agent(graph)
-        traced.invoke({"query": "test"})
+    def test_report_collects_trace(self, invoked_traced, agentrace_report):
         # Should not raise
-        agentrace_report(traced.last_trace)
+        agentrace_report(invoked_traced.last_trace)
 
 
 @pytest.mark.agentrace
 class TestAgentraceMarker:
-    def test_marked_test_runs(self, traced_agent):
-        graph = create_simple_agent()
-        traced = traced_agent(graph)
-        traced.invoke({"query": "test"})
-        assertions.no_errors(traced.last_trace)
+    def test_marked_test_runs(self, invoked_traced):
+        assertions.no_errors(invoked_traced.last_trace)
@@ -1,42 +1,52 @@
 """Tests for Phase 2: wrap() API, Trace models, differ, interceptor, and Rich reporter."""
 
-import json
+import io
+import re
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypedDict
 
 import pytest
-from rich.console import Console
+from langgraph.graph import END, START, StateGraph
 
 from agentrace import Trace, assertions, to_mermaid, wrap
 from agentrace.core.differ import compute_state_diff
-from agentrace.core.models import NodeStatus
-from agentrace.reporters.terminal import print_trace
-from tests.agents.simple_agent import create_simple_agent
+from agentrace.core.models import NodeExecution, NodeStatus
 
 # ---------------------------------------------------------------------------
 # Fixtures
 # ---------------------------------------------------------------------------
 
 
-@pytest.fixture
-def agent():
-    return create_simple_agent()
+@pytest.fixture(scope="module")
+def agent(shared_simple_graph):
+    return shared_simple_graph
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def traced(agent):
     return wrap(agent)
 
 
-@pytest.fixture
+# One invocation shared by the read-only trace tests of this module.
+@pytest.fixture(scope="module")
 def result_and_trace(traced):
     result = traced.invoke({"query": "test query"})
     return result, traced.last_trace
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def trace(result_and_trace):
     return result_and_trace[1]
 
 
+@pytest.fixture
+def fresh_traced(shared_simple_graph):
+    """A TracedGraph of its own, for tests that invoke it or check ``last_trace``."""
+    return wrap(shared_simple_graph)
+
+
 # ---------------------------------------------------------------------------
 # TracedGraph.invoke() produces a Trace
 # ---------------------------------------------------------------------------
@@ -49,16 +59,69 @@ class TestTracedGraphInvoke:
         assert result["response"].startswith("Generated answer:")
 
     def test_invoke_produces_trace(self, trace):
-        assert isinstance(trace, Trace)
-
-    def test_trace_has_correct_nodes(self, trace):
-        assert trace.node_names == ["retriever", "processor", "generator"]
-
-    def test_last_trace_populated(self, traced):
-        assert traced.last_trace is None
-        traced.invoke({"query": "hello"})
-        assert traced.last_trace is not None
-        assert isinstance(traced.last_trace, Trace)
+        assert type(trace) is Trace
+
+    def test_last_trace_populated(self, fresh_traced):
+        assert fresh_traced.last_trace is None
+        fresh_traced.invoke({"query": "hello"})
+        assert fresh_traced.last_trace is not None
+        assert type(fresh_traced.last_trace) is Trace
+
+    def test_existing_callbacks_kept_and_config_untouched(self, fresh_traced):
+        from langchain_core.callbacks import BaseCallbackHandler
+
+        user_handler = BaseCallbackHandler()
+        config = {"callbacks": [user_handler], "tags": ["t"]}
+        fresh_traced.invoke({"query": "hello"}, config=config)
+        assert config == {"callbacks": [user_handler], "tags": ["t"]}
+        assert fresh_traced.last_trace.node_names == ["retriever", "processor", "generator"]
+
+
+class TestInterceptorReuse:
+    def test_earlier_trace_untouched_by_next_run(self, fresh_traced):
+        fresh_traced.invoke({"query": "first"})
+        first = fresh_traced.last_trace
+        fresh_traced.invoke({"query": "second"})
+        second = fresh_traced.last_trace
+        assert first is not second
+        assert first.metadata.input_data == {"query": "first"}
+        assert len(first.nodes) == 3
+        assert len(second.nodes) == 3
+
+    def test_interceptor_reused_between_runs(self, fresh_traced):
+        fresh_traced.invoke({"query": "first"})
+        idle = fresh_traced._idle_interceptor
+        fresh_traced.invoke({"query": "second"})
+        assert fresh_traced._idle_interceptor is idle
+
+    def test_threads_never_share_an_interceptor(self, fresh_traced):
+        fresh_traced._release_interceptor(fresh_traced._acquire_interceptor())
+        barrier = threading.Barrier(8)
+
+        def acquire(_):
+            barrier.wait()
+            return fresh_traced._acquire_interceptor()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            taken = list(pool.map(acquire, range(8)))
+        assert len({id(i) for i in taken}) == 8
+
+    def test_threaded_invokes_keep_traces_separate(self, fresh_traced, monkeypatch):
+        finished = []
+        release = fresh_traced._release_interceptor
+
+        def record_and_release(interceptor):
+            finished.append(interceptor.trace)
+            release(interceptor)
+
+        monkeypatch.setattr(fresh_traced, "_release_interceptor", record_and_release)
+        queries = [f"q{i}" for i in range(16)]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(lambda q: fresh_traced.invoke({"query": q}), queries))
+        assert sorted(t.metadata.input_data["query"] for t in finished) == sorted(queries)
+        for t in finished:
+            assert t.node_names == ["retriever", "processor", "generator"]
+            assert t.nodes[0].state_before == t.metadata.input_data
 
 
 # ---------------------------------------------------------------------------
@@ -67,28 +130,117 @@ class TestTracedGraphInvoke:
 
 
 class TestTracedGraphStream:
-    def test_stream_yields_chunks(self, traced):
-        chunks = list(traced.stream({"query": "test"}))
+    def test_stream_yields_chunks(self, fresh_traced):
+        chunks = list(fresh_traced.stream({"query": "test"}))
         assert len(chunks) > 0
 
-    def test_stream_captures_trace(self, traced):
-        list(traced.stream({"query": "test"}))
-        trace = traced.last_trace
-        assert isinstance(trace, Trace)
+    def test_stream_captures_trace(self, fresh_traced):
+        # Drain the stream without keeping the chunks
+        deque(fresh_traced.stream({"query": "test"}), maxlen=0)
+        trace = fresh_traced.last_trace
+        assert type(trace) is Trace
         assert len(trace.nodes) > 0
 
 
+# ---------------------------------------------------------------------------
+# TracedGraph.batch()
+# ---------------------------------------------------------------------------
+
+
+class TestTracedGraphBatch:
+    def test_batch_returns_outputs_in_order(self, fresh_traced):
+        results = fresh_traced.batch([{"query": "alpha"}, {"query": "beta"}])
+        assert "alpha" in results[0]["response"].lower()
+        assert "beta" in results[1]["response"].lower()
+
+    def test_batch_captures_one_trace_per_input(self, fresh_traced):
+        fresh_traced.batch([{"query": "alpha"}, {"query": "beta"}])
+        traces = fresh_traced.last_traces
+        assert [t.metadata.input_data["query"] for t in traces] == ["alpha", "beta"]
+        for t in traces:
+            assert t.node_names == ["retriever", "processor", "generator"]
+        assert fresh_traced.last_trace is traces[-1]
+
+    def test_batch_accepts_per_input_config(self, fresh_traced):
+        configs = [{"tags": ["a"]}, {"tags": ["b"]}]
+        fresh_traced.batch([{"query": "alpha"}, {"query": "beta"}], config=configs)
+        assert len(fresh_traced.last_traces) == 2
+        # Caller configs are not mutated by the callback merge
+        assert configs == [{"tags": ["a"]}, {"tags": ["b"]}]
+
+
+# ---------------------------------------------------------------------------
+# AGENTRACE_DISABLED pass-through
+# ---------------------------------------------------------------------------
+
+
+class TestTracingDisabled:
+    @pytest.fixture
+    def disabled(self, monkeypatch):
+        from agentrace.core import config
+
+        monkeypatch.setattr(config, "TRACING_DISABLED", True)
+
+    def test_invoke_passes_through(self, disabled, agent):
+        traced = wrap(agent)
+        result = traced.invoke({"query": "off"})
+        assert result["response"].startswith("Generated answer:")
+        assert traced.last_trace is None
+
+    def test_stream_passes_through(self, disabled, agent):
+        traced = wrap(agent)
+        assert len(list(traced.stream({"query": "off"}))) > 0
+        assert traced.last_trace is None
+
+
+# ---------------------------------------------------------------------------
+# Sampled tracing
+# ---------------------------------------------------------------------------
+
+
+class TestSampling:
+    def test_default_records_every_node(self, trace):
+        assert trace.metadata.sample_rate == 1
+        assert trace.metadata.sampled_count == 0
+
+    def test_sample_records_every_nth_node(self, agent):
+        traced = wrap(agent, sample=3)
+        result = traced.invoke({"query": "sampled"})
+        trace = traced.last_trace
+        # retriever -> processor -> generator: only the 3rd is kept
+        assert trace.node_names == ["generator"]
+        assert trace.metadata.sample_rate == 3
+        assert trace.metadata.sampled_count == 2
+        # Skipped nodes still feed the accumulated state
+        assert trace.nodes[0].state_after["processed"] == result["processed"]
+
+    def test_sample_always_records_errors(self, error_graph):
+        traced = wrap(error_graph, sample=10)
+
+        with pytest.raises(ValueError):
+            traced.invoke({"v": ""})
+        assert traced.last_trace.node_names == ["bad_node"]
+        assert traced.last_trace.nodes[0].status == NodeStatus.ERROR
+
+    def test_invalid_sample_rejected(self, agent):
+        with pytest.raises(ValueError, match="sample"):
+            wrap(agent, sample=0)
+
+
 # ---------------------------------------------------------------------------
 # Trace model properties
 # ---------------------------------------------------------------------------
 
 
 class TestTraceModel:
-    def test_node_names_order(self, trace):
+    def test_trace_invariants(self, trace):
         assert trace.node_names == ["retriever", "processor", "generator"]
-
-    def test_successful_property(self, trace):
         assert trace.successful is True
+        meta = trace.metadata
+        assert meta.total_nodes == 3
+        assert meta.duration_ms > 0
+        assert meta.error_count == 0
+        assert meta.input_data == {"query": "test query"}
 
     def test_get_node(self, trace):
         node = trace.get_node("processor")
@@ -98,21 +250,68 @@ class TestTraceModel:
     def test_get_node_missing(self, trace):
         assert trace.get_node("nonexistent") is None
 
-    def test_metadata_populated(self, trace):
-        meta = trace.metadata
-        assert meta.total_nodes == 3
-        assert meta.duration_ms > 0
-        assert meta.error_count == 0
-        assert meta.input_data == {"query": "test query"}
+    def test_node_positions(self, trace):
+        assert trace.node_positions == {"retriever": 0, "processor": 1, "generator": 2}
+
+    def test_get_node_sees_appended_nodes(self):
+        trace = Trace()
+        assert trace.get_node("late") is None
+        trace.nodes.append(NodeExecution(node_name="late", step=1))
+        assert trace.get_node("late") is trace.nodes[0]
+        assert trace.node_positions == {"late": 0}
+
+    def test_node_columns(self, trace):
+        cols = trace.node_columns
+        assert cols.names == trace.node_names
+        assert cols.statuses == ["success"] * 3
+        assert cols.durations_ms == [n.duration_ms for n in trace.nodes]
+        assert cols.states_after[0] is trace.nodes[0].state_after
+        assert trace.node_columns is cols
+
+    def test_node_columns_empty_trace(self):
+        assert Trace().node_columns.names == []
+
+    def test_equality_ignores_lookup_index(self, trace):
+        a = Trace.model_validate(trace.model_dump())
+        b = Trace.model_validate(trace.model_dump())
+        assert a == b
+        assert a.node_names
+        assert a.get_node("processor") is not None
+        assert a == b
+        assert b == a
+        b.nodes.pop()
+        assert a != b
+
+    def test_equality_ignores_node_columns_cache(self, trace):
+        a = Trace.model_validate(trace.model_dump())
+        b = Trace.model_validate(trace.model_dump())
+        assert a.node_columns.names == ["retriever", "processor", "generator"]
+        assert a._columns is not None
+        assert a == b
+
+    def test_node_names_cached_until_nodes_change(self, fresh_traced):
+        fresh_traced.invoke({"query": "test query"})
+        trace = fresh_traced.last_trace
+        assert trace.node_names
+        assert trace._index_key is not None
+        trace.nodes.append(NodeExecution(node_name="extra", step=4))
+        assert trace.node_names[-1] == "extra"
+
+    def test_node_names_returns_a_copy(self, fresh_traced):
+        fresh_traced.invoke({"query": "test query"})
+        trace = fresh_traced.last_trace
+        names = trace.node_names
+        names.sort()
+        names.append("extra")
+        assert trace.node_names == ["retriever", "processor", "generator"]
+        assert trace.get_node("extra") is None
 
     def test_nodes_have_timing(self, trace):
-        for node in trace.nodes:
-            assert node.duration_ms >= 0
-            assert node.timestamp_end >= node.timestamp_start
+        assert all(n.duration_ms >= 0 for n in trace.nodes)
+        assert all(n.timestamp_end >= n.timestamp_start for n in trace.nodes)
 
     def test_nodes_have_status(self, trace):
-        for node in trace.nodes:
-            assert node.status == NodeStatus.SUCCESS
+        assert all(n.status is NodeStatus.SUCCESS for n in trace.nodes)
 
 
 # ---------------------------------------------------------------------------
@@ -142,8 +341,30 @@ class TestStateDiff:
 
     def test_nodes_have_state_diff(self, trace):
         # At least one node should have a state diff (they all add keys)
-        diffs = [n.state_diff for n in trace.nodes if n.state_diff is not None]
-        assert len(diffs) > 0
+        assert any(n.state_diff is not None for n in trace.nodes)
+
+    def test_state_snapshots_are_shared_not_mutated(self, trace):
+        retriever, processor, _ = trace.nodes
+        # Copy-on-write: the next node starts from the previous node's result
+        assert processor.state_before is retriever.state_after
+        # ...and later updates never leak into earlier snapshots
+        assert "processed" not in retriever.state_after
+        assert "documents" not in retriever.state_before
+
+    def test_empty_update_reuses_snapshot(self):
+        class S(TypedDict):
+            v: str
+
+        builder = StateGraph(S)
+        builder.add_node("noop", lambda state: {})
+        builder.add_edge(START, "noop")
+        builder.add_edge("noop", END)
+        traced = wrap(builder.compile())
+        traced.invoke({"v": "x"})
+
+        node = traced.last_trace.nodes[0]
+        assert node.state_after is node.state_before
+        assert node.state_diff is None
 
 
 # ---------------------------------------------------------------------------
@@ -162,41 +383,52 @@ class TestEdgeTransitions:
         assert edges[1].from_node == "processor"
         assert edges[1].to_node == "generator"
 
+    def test_edge_names_share_node_name_objects(self, trace):
+        for edge, node in zip(trace.edges, trace.nodes[1:]):
+            assert edge.to_node is node.node_name
+
+    def test_edge_timestamp_is_target_node_start(self, trace):
+        for edge, node in zip(trace.edges, trace.nodes[1:]):
+            assert edge.step == node.step
+            assert edge.timestamp == node.timestamp_start
+
 
 # ---------------------------------------------------------------------------
 # Error handling
 # ---------------------------------------------------------------------------
 
 
-class TestErrorHandling:
-    def test_node_error_captured(self):
-        """A node that raises should be captured with ERROR status."""
-        from typing import TypedDict
+@pytest.fixture(scope="module")
+def good_bad_trace():
+    """The partial trace of a graph whose second node raises after a successful first."""
 
-        from langgraph.graph import END, START, StateGraph
+    class ErrState(TypedDict):
+        value: str
 
-        class ErrState(TypedDict):
-            value: str
+    def good_node(state: ErrState) -> dict:
+        return {"value": "ok"}
 
-        def good_node(state: ErrState) -> dict:
-            return {"value": "ok"}
+    def bad_node(state: ErrState) -> dict:
+        raise ValueError("something went wrong")
 
-        def bad_node(state: ErrState) -> dict:
-            raise ValueError("something went wrong")
+    builder = StateGraph(ErrState)
+    builder.add_node("good", good_node)
+    builder.add_node("bad", bad_node)
+    builder.add_edge(START, "good")
+    builder.add_edge("good", "bad")
+    builder.add_edge("bad", END)
+    graph = builder.compile()
 
-        builder = StateGraph(ErrState)
-        builder.add_node("good", good_node)
-        builder.add_node("bad", bad_node)
-        builder.add_edge(START, "good")
-        builder.add_edge("good", "bad")
-        builder.add_edge("bad", END)
-        graph = builder.compile()
+    traced = wrap(graph)
+    with pytest.raises(ValueError, match="something went wrong"):
+        traced.invoke({"value": "start"})
+    return traced.last_trace
 
-        traced = wrap(graph)
-        with pytest.raises(ValueError, match="something went wrong"):
-            traced.invoke({"value": "start"})
 
-        trace = traced.last_trace
+class TestErrorHandling:
+    def test_node_error_captured(self, good_bad_trace):
+        """A node that raises should be captured with ERROR status."""
+        trace = good_bad_trace
         assert trace is not None
         # The good node should be SUCCESS
         good = trace.get_node("good")
@@ -208,6 +440,10 @@ class TestErrorHandling:
         assert bad.status == NodeStatus.ERROR
         assert "something went wrong" in bad.error
 
+    def test_single_failing_node_captured(self, error_trace):
+        assert error_trace.node_names == ["bad_node"]
+        assert error_trace.nodes[0].status == NodeStatus.ERROR
+
 
 # ---------------------------------------------------------------------------
 # Pydantic serialization
@@ -215,18 +451,15 @@ class TestErrorHandling:
 
 
 class TestSerialization:
-    def test_model_dump_json(self, trace):
-        json_str = trace.model_dump_json()
-        data = json.loads(json_str)
-        assert "metadata" in data
-        assert "nodes" in data
-        assert "edges" in data
-        assert len(data["nodes"]) == 3
-
-    def test_model_dump(self, trace):
+    def test_serialization(self, trace):
         data = trace.model_dump()
-        assert isinstance(data, dict)
+        assert {"metadata", "nodes", "edges"} <= data.keys()
+        assert len(data["nodes"]) == 3
         assert data["nodes"][0]["node_name"] == "retriever"
+        # JSON validity is covered by TestSerializationEdgeCases; only check the type here
+        json_str = trace.model_dump_json()
+        assert isinstance(json_str, str)
+        assert json_str.startswith("{")
 
 
 # ---------------------------------------------------------------------------
@@ -234,121 +467,100 @@ class TestSerialization:
 # ---------------------------------------------------------------------------
 
 
-class TestAssertionsWithTrace:
-    def test_node_was_visited_with_trace(self, trace):
-        assertions.node_was_visited(trace, "retriever")
-        assertions.node_was_visited(trace, "processor")
-        assertions.node_was_visited(trace, "generator")
-
-    def test_node_was_visited_fails_with_trace(self, trace):
-        with pytest.raises(AssertionError, match="NOT visited"):
-            assertions.node_was_visited(trace, "nonexistent")
-
-    def test_node_was_not_visited(self, trace):
-        assertions.node_was_not_visited(trace, "nonexistent")
-
-    def test_node_was_not_visited_fails(self, trace):
-        with pytest.raises(AssertionError, match="WAS visited"):
-            assertions.node_was_not_visited(trace, "retriever")
-
-    def test_node_visited_before(self, trace):
-        assertions.node_visited_before(trace, "retriever", "processor")
-        assertions.node_visited_before(trace, "retriever", "generator")
-        assertions.node_visited_before(trace, "processor", "generator")
-
-    def test_node_visited_before_fails_wrong_order(self, trace):
-        with pytest.raises(AssertionError, match="NOT visited before"):
-            assertions.node_visited_before(trace, "generator", "retriever")
-
-    def test_node_visited_before_fails_missing_node(self, trace):
-        with pytest.raises(AssertionError, match="NOT visited"):
-            assertions.node_visited_before(trace, "missing", "retriever")
-
-    def test_edge_taken(self, trace):
-        assertions.edge_taken(trace, "retriever", "processor")
-        assertions.edge_taken(trace, "processor", "generator")
-
-    def test_edge_taken_fails(self, trace):
-        with pytest.raises(AssertionError, match="NOT taken"):
-            assertions.edge_taken(trace, "retriever", "generator")
+_PASSING_ASSERTIONS = {
+    "node_was_visited": lambda t: (
+        assertions.node_was_visited(t, "retriever"),
+        assertions.node_was_visited(t, "processor"),
+        assertions.node_was_visited(t, "generator"),
+    ),
+    "all_nodes_visited": lambda t: assertions.all_nodes_visited(
+        t, ("retriever", "processor", "generator")
+    ),
+    "node_was_not_visited": lambda t: assertions.node_was_not_visited(t, "nonexistent"),
+    "node_visited_before": lambda t: (
+        assertions.node_visited_before(t, "retriever", "processor"),
+        assertions.node_visited_before(t, "retriever", "generator"),
+        assertions.node_visited_before(t, "processor", "generator"),
+    ),
+    "edge_taken": lambda t: (
+        assertions.edge_taken(t, "retriever", "processor"),
+        assertions.edge_taken(t, "processor", "generator"),
+    ),
+    "no_errors": assertions.no_errors,
+    "total_nodes_visited_exact": lambda t: assertions.total_nodes_visited(t, min=3, max=3),
+    "total_nodes_visited_range": lambda t: assertions.total_nodes_visited(t, min=1, max=10),
+    "total_nodes_visited_min_only": lambda t: assertions.total_nodes_visited(t, min=2),
+    "total_nodes_visited_max_only": lambda t: assertions.total_nodes_visited(t, max=5),
+    # --- Advanced assertions (task-016) ---
+    "state_at_node": lambda t: assertions.state_at_node(t, "retriever", lambda s: "documents" in s),
+    # Our mock nodes are very fast, 1000ms should be plenty
+    "max_duration": lambda t: assertions.max_duration(t, "retriever", ms=1000),
+}
+
+# Failure messages are matched with patterns compiled once at import
+_NOT_VISITED = re.compile("NOT visited")
+
+_FAILING_ASSERTIONS = {
+    "node_was_visited": (
+        lambda t: assertions.node_was_visited(t, "nonexistent"),
+        _NOT_VISITED,
+    ),
+    "node_was_not_visited": (
+        lambda t: assertions.node_was_not_visited(t, "retriever"),
+        re.compile("WAS visited"),
+    ),
+    "node_visited_before_wrong_order": (
+        lambda t: assertions.node_visited_before(t, "generator", "retriever"),
+        re.compile("NOT visited before"),
+    ),
+    "node_visited_before_missing_node": (
+        lambda t: assertions.node_visited_before(t, "missing", "retriever"),
+        _NOT_VISITED,
+    ),
+    "edge_taken": (
+        lambda t: assertions.edge_taken(t, "retriever", "generator"),
+        re.compile("NOT taken"),
+    ),
+    "total_nodes_visited_min": (
+        lambda t: assertions.total_nodes_visited(t, min=10),
+        re.compile("at least 10"),
+    ),
+    "total_nodes_visited_max": (
+        lambda t: assertions.total_nodes_visited(t, max=1),
+        re.compile("at most 1"),
+    ),
+    "state_at_node": (
+        lambda t: assertions.state_at_node(t, "retriever", lambda s: "nonexistent_key" in s),
+        re.compile("State predicate failed"),
+    ),
+    "state_at_node_missing_node": (
+        lambda t: assertions.state_at_node(t, "missing", lambda s: True),
+        _NOT_VISITED,
+    ),
+    # 0ms is impossible to beat
+    "max_duration": (
+        lambda t: assertions.max_duration(t, "retriever", ms=0),
+        re.compile("exceeding limit"),
+    ),
+}
 
-    def test_no_errors(self, trace):
-        assertions.no_errors(trace)
 
-    def test_no_errors_fails(self):
+class TestAssertionsWithTrace:
+    @pytest.mark.parametrize("check", _PASSING_ASSERTIONS.values(), ids=_PASSING_ASSERTIONS.keys())
+    def test_assertion_passes(self, trace, check):
+        check(trace)
+
+    @pytest.mark.parametrize(
+        "check, match", _FAILING_ASSERTIONS.values(), ids=_FAILING_ASSERTIONS.keys()
+    )
+    def test_assertion_fails(self, trace, check, match):
+        with pytest.raises(AssertionError, match=match):
+            check(trace)
+
+    def test_no_errors_fails(self, error_trace):
         """A trace with an errored node should fail no_errors."""
-        from typing import TypedDict
-
-        from langgraph.graph import END, START, StateGraph
-
-        class S(TypedDict):
-            v: str
-
-        def fail_node(state: S) -> dict:
-            raise RuntimeError("boom")
-
-        builder = StateGraph(S)
-        builder.add_node("fail", fail_node)
-        builder.add_edge(START, "fail")
-        builder.add_edge("fail", END)
-        graph = builder.compile()
-
-        traced = wrap(graph)
-        with pytest.raises(RuntimeError):
-            traced.invoke({"v": ""})
-
         with pytest.raises(AssertionError, match="1 node.*had errors"):
-            assertions.no_errors(traced.last_trace)
-
-    def test_total_nodes_visited_exact(self, trace):
-        assertions.total_nodes_visited(trace, min=3, max=3)
-
-    def test_total_nodes_visited_range(self, trace):
-        assertions.total_nodes_visited(trace, min=1, max=10)
-
-    def test_total_nodes_visited_min_only(self, trace):
-        assertions.total_nodes_visited(trace, min=2)
-
-    def test_total_nodes_visited_max_only(self, trace):
-        assertions.total_nodes_visited(trace, max=5)
-
-    def test_total_nodes_visited_fails_min(self, trace):
-        with pytest.raises(AssertionError, match="at least 10"):
-            assertions.total_nodes_visited(trace, min=10)
-
-    def test_total_nodes_visited_fails_max(self, trace):
-        with pytest.raises(AssertionError, match="at most 1"):
-            assertions.total_nodes_visited(trace, max=1)
-
-    # --- Advanced assertions (task-016) ---
-
-    def test_state_at_node(self, trace):
-        assertions.state_at_node(
-            trace,
-            "retriever",
-            lambda s: "documents" in s,
-        )
-
-    def test_state_at_node_fails(self, trace):
-        with pytest.raises(AssertionError, match="State predicate failed"):
-            assertions.state_at_node(
-                trace,
-                "retriever",
-                lambda s: "nonexistent_key" in s,
-            )
-
-    def test_state_at_node_missing_node(self, trace):
-        with pytest.raises(AssertionError, match="NOT visited"):
-            assertions.state_at_node(trace, "missing", lambda s: True)
-
-    def test_max_duration(self, trace):
-        # Our mock nodes are very fast, 1000ms should be plenty
-        assertions.max_duration(trace, "retriever", ms=1000)
-
-    def test_max_duration_fails(self, trace):
-        # 0ms is impossible to beat
-        with pytest.raises(AssertionError, match="exceeding limit"):
-            assertions.max_duration(trace, "retriever", ms=0)
+            assertions.no_errors(error_trace)
 
 
 # ---------------------------------------------------------------------------
@@ -356,30 +568,31 @@ class TestAssertionsWithTrace:
 # ---------------------------------------------------------------------------
 
 
+@pytest.fixture(scope="module")
+def mermaid(trace):
+    """One rendered diagram shared by the read-only content checks."""
+    return to_mermaid(trace)
+
+
 class TestMermaidGenerator:
-    def test_to_mermaid_basic(self, trace):
-        mermaid = to_mermaid(trace)
+    def test_to_mermaid_basic(self, mermaid):
         assert mermaid.startswith("graph TD")
         assert "retriever" in mermaid
         assert "processor" in mermaid
         assert "generator" in mermaid
 
-    def test_to_mermaid_contains_edges(self, trace):
-        mermaid = to_mermaid(trace)
+    def test_to_mermaid_contains_edges(self, mermaid):
         assert "retriever --> processor" in mermaid
         assert "processor --> generator" in mermaid
 
-    def test_to_mermaid_contains_start_end(self, trace):
-        mermaid = to_mermaid(trace)
+    def test_to_mermaid_contains_start_end(self, mermaid):
         assert "START" in mermaid
         assert "END" in mermaid
 
-    def test_to_mermaid_contains_timing(self, trace):
-        mermaid = to_mermaid(trace)
+    def test_to_mermaid_contains_timing(self, mermaid):
         assert "ms" in mermaid
 
-    def test_to_mermaid_contains_styles(self, trace):
-        mermaid = to_mermaid(trace)
+    def test_to_mermaid_contains_styles(self, mermaid):
         assert "style retriever" in mermaid
         assert "#28a745" in mermaid  # success green
 
@@ -392,53 +605,91 @@ class TestMermaidGenerator:
         assert "graph TD" in mermaid
         assert "retriever" in mermaid
 
-    def test_to_mermaid_error_node_style(self):
+    def test_to_mermaid_error_node_style(self, error_trace):
         """Errored nodes should have red styling."""
-        from typing import TypedDict
+        mermaid = to_mermaid(error_trace)
+        assert "#dc3545" in mermaid  # error red
 
-        from langgraph.graph import END, START, StateGraph
 
-        class S(TypedDict):
-            v: str
+# ---------------------------------------------------------------------------
+# Rich reporter
+# ---------------------------------------------------------------------------
 
-        def fail_node(state: S) -> dict:
-            raise RuntimeError("boom")
 
-        builder = StateGraph(S)
-        builder.add_node("fail", fail_node)
-        builder.add_edge(START, "fail")
-        builder.add_edge("fail", END)
-        graph = builder.compile()
+# The terminal reporter pulls in Rich, so it is imported when a test asks for it,
+# not at collection.
+@pytest.fixture(scope="module")
+def print_trace():
+    from agentrace.reporters.terminal import print_trace
 
-        traced = wrap(graph)
-        with pytest.raises(RuntimeError):
-            traced.invoke({"v": ""})
+    return print_trace
 
-        mermaid = to_mermaid(traced.last_trace)
-        assert "#dc3545" in mermaid  # error red
 
+@pytest.fixture(scope="module")
+def rich_console():
+    """One plain-text console for the smoke tests, which never read its output."""
+    from rich.console import Console
 
-# ---------------------------------------------------------------------------
-# Rich reporter
-# ---------------------------------------------------------------------------
+    return Console(file=io.StringIO(), force_terminal=False, width=120)
+
+
+@pytest.fixture(scope="module")
+def dict_trace(agent):
+    from agentrace import capture
+
+    return capture(agent, {"query": "test"})
 
 
 class TestRichReporter:
-    def test_print_trace_runs(self, trace):
-        console = Console(file=None, force_terminal=True, width=120)
+    def test_print_trace_runs(self, print_trace, trace, rich_console):
         # Should not raise
-        print_trace(trace, console=console)
+        print_trace(trace, console=rich_console)
 
-    def test_print_trace_detailed(self, trace):
-        console = Console(file=None, force_terminal=True, width=120)
+    def test_print_trace_detailed(self, print_trace, trace, rich_console):
         # Should not raise
-        print_trace(trace, detailed=True, console=console)
+        print_trace(trace, detailed=True, console=rich_console)
 
-    def test_print_trace_dict_still_works(self):
+    def test_bracketed_error_text_shown_verbatim(self, print_trace):
+        from rich.console import Console
+
+        trace = Trace(
+            nodes=[
+                NodeExecution(
+                    node_name="bad", step=1, status=NodeStatus.ERROR, error="KeyError: [red]x"
+                )
+            ]
+        )
+        out = io.StringIO()
+        print_trace(trace, console=Console(file=out, width=120))
+        assert "error: KeyError: [red]x" in out.getvalue()
+
+    def test_print_trace_dict_still_works(self, print_trace, dict_trace, rich_console):
         """Legacy dict traces should still render."""
-        from agentrace import capture
+        print_trace(dict_trace, console=rich_console)
+
+
+# ---------------------------------------------------------------------------
+# Package import cost
+# ---------------------------------------------------------------------------
+
+
+class TestLazyReporterImports:
+    def test_import_does_not_load_reporters(self):
+        import subprocess
+        import sys
+
+        code = (
+            "import sys, agentrace; "
+            "assert 'agentrace.reporters.terminal' not in sys.modules; "
+            "assert 'rich' not in sys.modules; "
+            "agentrace.print_trace; "
+            "assert 'agentrace.reporters.terminal' in sys.modules"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_plugin_import_does_not_load_rich(self):
+        import subprocess
+        import sys
 
-        agent = create_simple_agent()
-        dict_trace = capture(agent, {"query": "test"})
-        console = Console(file=None, force_terminal=True, width=120)
-        print_trace(dict_trace, console=console)
+        code = "import sys, agentrace.plugin; assert 'rich' not in sys.modules"
+        subprocess.run([sys.executable, "-c", code], check=True)